@@ -1,3 +1,5 @@
+from functools import cached_property, lru_cache
+from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -8,6 +10,9 @@ class Settings(BaseSettings):
     # Polygon API key (optional)
     polygon_api_key: Optional[str] = None
 
+    # Polygon requests allowed per minute (free tier: 5); raise it for paid plans
+    polygon_requests_per_minute: int = 5
+
     # Alpha Vantage API key (optional)
     alpha_vantage_api_key: Optional[str] = None
 
@@ -18,6 +23,12 @@ class Settings(BaseSettings):
     # Enable fallback to yfinance if other providers fail
     enable_fallback: bool = True
 
+    # Directory for on-disk provider caches (survive restarts)
+    cache_dir: str = ".cache"
+
+    # Disable the on-disk provider data caches (e.g. for tests); rate-limit and quota state is still persisted
+    cache_disable: bool = False
+
     # Schwab OAuth Configuration
     schwab_app_key: Optional[str] = None
     schwab_app_secret: Optional[str] = None
@@ -47,6 +58,18 @@ class Settings(BaseSettings):
         """Check if Alpha Vantage API key is configured."""
         return self.alpha_vantage_api_key is not None and len(self.alpha_vantage_api_key.strip()) > 0
 
+    @computed_field
+    @cached_property
+    def cors_origins_list(self) -> list[str]:
+        """CORS origins parsed (once) from the comma-separated cors_origins setting."""
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once; .env is parsed and validated only on the first call."""
+    return Settings()
+
 
 # Create a single instance to be imported throughout the app
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
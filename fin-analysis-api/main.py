@@ -1,19 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from routers import financial_data, schwab_oauth
+from services.financial_data_service import financial_data_service
 from config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up provider clients so the first request doesn't pay for setup."""
+    financial_data_service.warmup()
+    yield
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Financial Analysis API",
     description="Financial data API with hybrid provider support (yfinance, Alpha Vantage, Polygon.io) featuring ROCE and Earnings Yield calculations",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS using environment variable
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
+    allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -24,29 +37,33 @@ app.include_router(financial_data.router)
 app.include_router(schwab_oauth.router)
 
 
+# Static API information served by the root endpoint
+_ROOT_RESPONSE = {
+    "message": "Financial Analysis API",
+    "version": "3.0.0",
+    "providers": {
+        "supported": ["yfinance", "alphavantage", "polygon"],
+        "default": "yfinance",
+        "description": "Hybrid provider support with automatic fallback. Priority: yfinance (free, unlimited) > alphavantage (25/day) > polygon (deprecated endpoint)"
+    },
+    "endpoints": {
+        "health": "/api/v1/health",
+        "financials": "/api/v1/financials/{ticker}?timeframe=annual&limit=1",
+        "metrics": "/api/v1/metrics/{ticker}?timeframe=annual",
+        "docs": "/docs"
+    },
+    "examples": {
+        "default": "/api/v1/metrics/AAPL?timeframe=annual",
+        "alphavantage": "/api/v1/metrics/AAPL?timeframe=annual&provider=alphavantage",
+        "yfinance": "/api/v1/metrics/AAPL?timeframe=annual&provider=yfinance"
+    }
+}
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": "Financial Analysis API",
-        "version": "3.0.0",
-        "providers": {
-            "supported": ["yfinance", "alphavantage", "polygon"],
-            "default": "yfinance",
-            "description": "Hybrid provider support with automatic fallback. Priority: yfinance (free, unlimited) > alphavantage (25/day) > polygon (deprecated endpoint)"
-        },
-        "endpoints": {
-            "health": "/api/v1/health",
-            "financials": "/api/v1/financials/{ticker}?timeframe=annual&limit=1",
-            "metrics": "/api/v1/metrics/{ticker}?timeframe=annual",
-            "docs": "/docs"
-        },
-        "examples": {
-            "default": "/api/v1/metrics/AAPL?timeframe=annual",
-            "alphavantage": "/api/v1/metrics/AAPL?timeframe=annual&provider=alphavantage",
-            "yfinance": "/api/v1/metrics/AAPL?timeframe=annual&provider=yfinance"
-        }
-    }
+    return _ROOT_RESPONSE
 
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
+import asyncio
+import sys
+import threading
+from enum import IntFlag
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Literal
-from pydantic import BaseModel
+from typing import Annotated, Optional
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+from pydantic import AfterValidator, BaseModel, ConfigDict, computed_field
 from services.financial_data_service import financial_data_service
 from services.exceptions import RateLimitError, DataNotFoundError, APIKeyError, FinancialDataError
 
@@ -8,8 +15,106 @@ from services.exceptions import RateLimitError, DataNotFoundError, APIKeyError,
 router = APIRouter(prefix="/api/v1", tags=["Financial Data"])
 
 
+_TIMEFRAMES = frozenset({"annual", "quarterly"})
+
+
+def _check_timeframe(value: str) -> str:
+    """Validate a timeframe with a set lookup rather than a regex match."""
+    if value not in _TIMEFRAMES:
+        raise ValueError("timeframe must be 'annual' or 'quarterly'")
+    return value
+
+
+Timeframe = Annotated[str, AfterValidator(_check_timeframe)]
+
+
+def _norm_ticker(ticker: str) -> str:
+    """Normalize a ticker to uppercase without whitespace, skipping the copies when it already is."""
+    if ticker.isupper() and ticker == ticker.strip():
+        return ticker
+    return ticker.strip().upper()
+
+
+def format_percent(value: Optional[float]) -> Optional[str]:
+    """Format a decimal ratio as a percentage string (e.g., 0.1534 -> '15.34%')."""
+    return "%.2f%%" % (value * 100) if value else None
+
+
+# Short-lived caches so back-to-back requests for the same ticker don't re-hit the provider
+_financials_cache = TTLCache(maxsize=1024, ttl=60)
+_financials_lock = threading.Lock()
+_ticker_details_cache = TTLCache(maxsize=1024, ttl=60)
+
+
+def _peek_financials(ticker: str, timeframe: str, limit: int, provider: Optional[str]):
+    """Return cached financials for the request tuple without fetching, or None on a miss."""
+    with _financials_lock:
+        return _financials_cache.get(hashkey(ticker, timeframe, limit, provider))
+
+
+@cached(_financials_cache, lock=_financials_lock)
+def _get_financials(ticker: str, timeframe: str, limit: int, provider: Optional[str]):
+    """Fetch financials, cached per (ticker, timeframe, limit, provider)."""
+    return financial_data_service.get_financials(ticker, timeframe=timeframe, limit=limit, provider=provider)
+
+
+@cached(_ticker_details_cache, lock=threading.Lock())
+def _get_ticker_details(ticker: str, provider: Optional[str]):
+    """Fetch ticker details, cached per (ticker, provider)."""
+    return financial_data_service.get_ticker_details(ticker, provider=provider)
+
+
+# Balance sheet inputs for working capital and capital employed; any may be missing from a provider
+_ROCE_FIELDS = ('current_assets', 'current_liabilities', 'assets')
+
+
+class MetricNote(IntFlag):
+    """Conditions noted while calculating metrics, accumulated as a bitmask."""
+    NO_OPERATING_INCOME = 1
+    ZERO_CAPITAL_EMPLOYED = 2
+    CURRENT_DEBT_FROM_SHORT_TERM = 4
+    LTD_NONCURRENT_FROM_TOTAL_DEBT = 8
+    LTD_NONCURRENT_FROM_LONG_TERM_DEBT = 16
+    NO_CASH = 32
+    NO_EBIT = 64
+    NO_ENTERPRISE_VALUE = 128
+
+
+# Human-readable note for each flag, in the order they are reported.
+# Interned so every response shares the same string objects.
+_NOTE_MESSAGES = {flag: sys.intern(message) for flag, message in {
+    MetricNote.NO_OPERATING_INCOME: "Operating income not available",
+    MetricNote.ZERO_CAPITAL_EMPLOYED: "Capital employed is zero - cannot calculate ROCE",
+    MetricNote.CURRENT_DEBT_FROM_SHORT_TERM: "Current debt using short_term_debt (synonymous terms)",
+    MetricNote.LTD_NONCURRENT_FROM_TOTAL_DEBT: "Long-term debt noncurrent calculated from total_debt - current_debt",
+    MetricNote.LTD_NONCURRENT_FROM_LONG_TERM_DEBT: "Long-term debt noncurrent calculated from long_term_debt - current_long_term_debt",
+    MetricNote.NO_CASH: "Cash and cash equivalents not reported separately - EV calculation may be overstated",
+    MetricNote.NO_EBIT: "EBIT not available - cannot calculate earnings yield",
+    MetricNote.NO_ENTERPRISE_VALUE: "Enterprise value not available - cannot calculate earnings yield",
+}.items()}
+
+
+def describe_notes(mask: MetricNote) -> list[str]:
+    """Expand a MetricNote bitmask into its note strings."""
+    return [message for flag, message in _NOTE_MESSAGES.items() if mask & flag]
+
+
+class PeriodMetrics(BaseModel):
+    """Calculated metrics for a single reporting period."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    date: Optional[str] = None
+    fiscal_year: Optional[str] = None
+    fiscal_period: Optional[str] = None
+    working_capital: Optional[float] = None
+    capital_employed: Optional[float] = None
+    roce: Optional[float] = None
+
+
 class FinancialData(BaseModel):
     """Response model for financial data."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     ticker: str
     date: str
     fiscal_year: Optional[str] = None
@@ -34,24 +139,31 @@ class FinancialData(BaseModel):
     # Calculated Metrics
     working_capital: Optional[float] = None
     roce: Optional[float] = None
-    roce_percent: Optional[str] = None
+
+    # Calculated metrics for every period returned (latest first)
+    periods: list[PeriodMetrics] = []
+
+    @computed_field
+    @property
+    def roce_percent(self) -> Optional[str]:
+        return format_percent(self.roce)
 
 
 class StockMetrics(BaseModel):
     """Response model for calculated stock metrics."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     ticker: str
     date: str
     period: str
 
     # ROCE metrics
     roce: Optional[float] = None
-    roce_percent: Optional[str] = None
     working_capital: Optional[float] = None
     capital_employed: Optional[float] = None
 
     # Earnings Yield metrics
     earnings_yield: Optional[float] = None
-    earnings_yield_percent: Optional[str] = None
     ebit: Optional[float] = None
 
     # Enterprise Value components
@@ -78,29 +190,79 @@ class StockMetrics(BaseModel):
 
     notes: list[str] = []
 
+    @computed_field
+    @property
+    def roce_percent(self) -> Optional[str]:
+        return format_percent(self.roce)
+
+    @computed_field
+    @property
+    def earnings_yield_percent(self) -> Optional[str]:
+        return format_percent(self.earnings_yield)
 
-def calculate_roce(operating_income: float, total_assets: float, current_liabilities: float) -> Optional[float]:
+
+def calculate_roce(operating_income: float, capital_employed: float) -> Optional[float]:
     """
     Calculate Return on Capital Employed (ROCE).
 
-    Formula: Operating Income / (Total Assets - Current Liabilities)
+    Formula: Operating Income / Capital Employed, where Capital Employed = Total Assets - Current Liabilities
 
     Args:
         operating_income: Operating income (EBIT)
-        total_assets: Total assets
-        current_liabilities: Current liabilities
+        capital_employed: Total assets minus current liabilities
 
     Returns:
         ROCE as a decimal (e.g., 0.15 for 15%), or None if calculation is invalid
     """
-    capital_employed = total_assets - current_liabilities
-
     if capital_employed == 0:
         return None
 
     return operating_income / capital_employed
 
 
+def calculate_period_metrics(incomes: list[dict], balances: list[dict]) -> list[dict]:
+    """
+    Calculate working capital, capital employed and ROCE for several periods at once.
+
+    Missing balance sheet values count as zero, matching the single-period calculation.
+    ROCE is None when operating income or total assets are missing/zero, or capital employed is zero.
+
+    Args:
+        incomes: Extracted income statements, one per period
+        balances: Extracted balance sheets, one per period (same order as incomes)
+
+    Returns:
+        List of per-period metric dicts
+    """
+    def column(rows: list[dict], key: str) -> np.ndarray:
+        # None becomes NaN under a float64 dtype
+        return np.array([row.get(key) for row in rows], dtype=np.float64)
+
+    operating_income = column(incomes, 'operating_income_loss')
+    current_assets = np.nan_to_num(column(balances, 'current_assets'))
+    current_liabilities = np.nan_to_num(column(balances, 'current_liabilities'))
+    total_assets = np.nan_to_num(column(balances, 'assets'))
+
+    working_capital = current_assets - current_liabilities
+    capital_employed = total_assets - current_liabilities
+
+    valid = ~np.isnan(operating_income) & (operating_income != 0) & (total_assets != 0) & (capital_employed != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roce = np.where(valid, operating_income / capital_employed, np.nan)
+
+    return [
+        {
+            "date": income.get('date'),
+            "fiscal_year": income.get('fiscal_year'),
+            "fiscal_period": income.get('fiscal_period'),
+            "working_capital": wc,
+            "capital_employed": ce,
+            "roce": None if np.isnan(r) else r,
+        }
+        for income, wc, ce, r in zip(incomes, working_capital.tolist(), capital_employed.tolist(), roce.tolist())
+    ]
+
+
 def calculate_market_cap(stock_price: float, shares_outstanding: float) -> Optional[float]:
     """
     Calculate Market Capitalization.
@@ -198,7 +360,7 @@ async def health_check():
 @router.get("/financials/{ticker}", response_model=FinancialData)
 async def get_financial_data(
     ticker: str,
-    timeframe: str = Query(default="annual", pattern="^(annual|quarterly)$"),
+    timeframe: Annotated[Timeframe, Query()] = "annual",
     limit: int = Query(default=1, ge=1, le=10),
     provider: Optional[str] = Query(None, description="Data provider: 'polygon' or 'yfinance'")
 ):
@@ -214,11 +376,11 @@ async def get_financial_data(
     Returns:
         Financial data including income statement and balance sheet
     """
-    ticker = ticker.strip().upper()
+    ticker = _norm_ticker(ticker)
 
     try:
         # Fetch data from financial data service with optional provider
-        result = financial_data_service.get_financials(ticker, timeframe=timeframe, limit=limit, provider=provider)
+        result = await asyncio.to_thread(_get_financials, ticker, timeframe, limit, provider)
 
         # Validate response
         if not result or result[0] is None:
@@ -236,26 +398,16 @@ async def get_financial_data(
                 detail=f"No financial data found for ticker {ticker}. Verify the ticker symbol."
             )
 
-        # Extract latest financial data
-        latest = financials_data[0]
+        # Extract statements for every period using the appropriate provider's methods
+        incomes = [financial_data_service.extract_income_statement(p, provider_used) for p in financials_data]
+        balances = [financial_data_service.extract_balance_sheet(p, provider_used) for p in financials_data]
 
-        # Extract statements using the appropriate provider's methods
-        income = financial_data_service.extract_income_statement(latest, provider_used)
-        balance = financial_data_service.extract_balance_sheet(latest, provider_used)
+        # Calculate working capital and ROCE for all periods in one pass
+        periods = calculate_period_metrics(incomes, balances)
 
-        # Calculate working capital and ROCE
-        current_assets = balance.get('current_assets') or 0
-        current_liabilities = balance.get('current_liabilities') or 0
-        working_capital = current_assets - current_liabilities
-
-        total_assets = balance.get('assets') or 0
-        operating_income = income.get('operating_income_loss')
-
-        roce = None
-        if operating_income and total_assets and current_liabilities is not None:
-            capital_employed = total_assets - current_liabilities
-            if capital_employed != 0:
-                roce = calculate_roce(operating_income, total_assets, current_liabilities)
+        # Latest period is reported at the top level
+        income, balance, latest = incomes[0], balances[0], periods[0]
+        roce = latest['roce']
 
         return FinancialData(
             ticker=ticker,
@@ -277,9 +429,9 @@ async def get_financial_data(
             total_liabilities=balance.get('liabilities'),
             equity=balance.get('equity'),
             # Calculated
-            working_capital=working_capital,
+            working_capital=latest['working_capital'],
             roce=roce,
-            roce_percent=f"{roce * 100:.2f}%" if roce else None
+            periods=periods
         )
 
     except RateLimitError as e:
@@ -314,7 +466,7 @@ async def get_financial_data(
 @router.get("/metrics/{ticker}", response_model=StockMetrics)
 async def get_stock_metrics(
     ticker: str,
-    timeframe: str = Query(default="annual", pattern="^(annual|quarterly)$"),
+    timeframe: Annotated[Timeframe, Query()] = "annual",
     provider: Optional[str] = Query(None, description="Data provider: 'polygon' or 'yfinance'")
 ):
     """
@@ -328,12 +480,29 @@ async def get_stock_metrics(
     Returns:
         Calculated stock metrics including ROCE and Earnings Yield
     """
-    ticker = ticker.strip().upper()
-    notes = []
+    ticker = _norm_ticker(ticker)
+    notes = MetricNote(0)
 
     try:
-        # Fetch data from financial data service with optional provider
-        result = financial_data_service.get_financials(ticker, timeframe=timeframe, limit=1, provider=provider)
+        # With financials already cached we can check EBIT before fetching ticker details;
+        # otherwise fetch both concurrently on worker threads (they are blocking provider calls)
+        result = _peek_financials(ticker, timeframe, 1, provider)
+        ticker_details_result = None
+        details_error = None
+        details_fetched = False
+        if result is None:
+            result, ticker_details_result = await asyncio.gather(
+                asyncio.to_thread(_get_financials, ticker, timeframe, 1, provider),
+                asyncio.to_thread(_get_ticker_details, ticker, provider),
+                return_exceptions=True
+            )
+            details_fetched = True
+            if isinstance(result, Exception):
+                raise result
+            # A details failure only matters if EBIT needs the market data (checked below),
+            # so the response matches the warm-cache path, which never fetches it otherwise
+            if isinstance(ticker_details_result, Exception):
+                details_error, ticker_details_result = ticker_details_result, None
 
         # Validate response
         if not result or result[0] is None:
@@ -360,9 +529,9 @@ async def get_stock_metrics(
 
         # Extract values for ROCE
         operating_income = income.get('operating_income_loss')
-        current_assets = balance.get('current_assets') or 0
-        current_liabilities = balance.get('current_liabilities') or 0
-        total_assets = balance.get('assets') or 0
+        current_assets, current_liabilities, total_assets = (
+            balance.get(field) or 0.0 for field in _ROCE_FIELDS
+        )
 
         working_capital = current_assets - current_liabilities
         capital_employed = total_assets - current_liabilities
@@ -370,11 +539,11 @@ async def get_stock_metrics(
         # Calculate ROCE
         roce = None
         if operating_income is None:
-            notes.append("Operating income not available")
+            notes |= MetricNote.NO_OPERATING_INCOME
         elif capital_employed == 0:
-            notes.append("Capital employed is zero - cannot calculate ROCE")
+            notes |= MetricNote.ZERO_CAPITAL_EMPLOYED
         else:
-            roce = calculate_roce(operating_income, total_assets, current_liabilities)
+            roce = calculate_roce(operating_income, capital_employed)
 
         # Extract values for Earnings Yield
         ebit = operating_income  # Operating income is EBIT
@@ -391,7 +560,7 @@ async def get_stock_metrics(
         # Use short_term_debt as fallback for current_debt (they are synonymous)
         if current_debt is None and short_term_debt is not None:
             current_debt = short_term_debt
-            notes.append("Current debt using short_term_debt (synonymous terms)")
+            notes |= MetricNote.CURRENT_DEBT_FROM_SHORT_TERM
 
         # Calculate long_term_debt_noncurrent if not available
         # long_term_debt_noncurrent = total_debt - current_debt OR long_term_debt - current_long_term_debt
@@ -399,19 +568,22 @@ async def get_stock_metrics(
             if short_long_term_debt_total is not None and current_debt is not None:
                 long_term_debt_noncurrent = short_long_term_debt_total - current_debt
                 if long_term_debt_noncurrent > 0:
-                    notes.append("Long-term debt noncurrent calculated from total_debt - current_debt")
+                    notes |= MetricNote.LTD_NONCURRENT_FROM_TOTAL_DEBT
             elif long_term_debt is not None and current_long_term_debt is not None:
                 long_term_debt_noncurrent = long_term_debt - current_long_term_debt
                 if long_term_debt_noncurrent > 0:
-                    notes.append("Long-term debt noncurrent calculated from long_term_debt - current_long_term_debt")
+                    notes |= MetricNote.LTD_NONCURRENT_FROM_LONG_TERM_DEBT
+
+        # Market data only feeds earnings yield, which needs EBIT - without it,
+        # skip the ticker details round-trip (or ignore a result already fetched)
+        market_cap = shares_outstanding = stock_price = None
 
-        # Get ticker details (has market cap and shares outstanding)
-        ticker_details_result = financial_data_service.get_ticker_details(ticker, provider=provider)
-        market_cap = None
-        shares_outstanding = None
-        stock_price = None
+        if operating_income is not None and not details_fetched:
+            ticker_details_result = await asyncio.to_thread(_get_ticker_details, ticker, provider)
+        elif operating_income is not None and details_error is not None:
+            raise details_error
 
-        if ticker_details_result and ticker_details_result[0]:
+        if operating_income is not None and ticker_details_result and ticker_details_result[0]:
             ticker_details, _ = ticker_details_result
             market_cap = ticker_details.get('market_cap')
             shares_outstanding = ticker_details.get('weighted_shares_outstanding')
@@ -433,15 +605,15 @@ async def get_stock_metrics(
 
         # Add note if cash data is missing
         if not cash_and_equivalents:
-            notes.append("Cash and cash equivalents not reported separately - EV calculation may be overstated")
+            notes |= MetricNote.NO_CASH
 
         # Calculate Earnings Yield
         earnings_yield = calculate_earnings_yield(ebit, enterprise_value)
 
-        if not enterprise_value:
-            notes.append("Enterprise value not available - cannot calculate earnings yield")
-        elif not ebit:
-            notes.append("EBIT not available - cannot calculate earnings yield")
+        if not ebit:
+            notes |= MetricNote.NO_EBIT
+        elif not enterprise_value:
+            notes |= MetricNote.NO_ENTERPRISE_VALUE
 
         return StockMetrics(
             ticker=ticker,
@@ -449,12 +621,10 @@ async def get_stock_metrics(
             period=timeframe,
             # ROCE metrics
             roce=roce,
-            roce_percent=f"{roce * 100:.2f}%" if roce else None,
             working_capital=working_capital,
             capital_employed=capital_employed,
             # Earnings Yield metrics
             earnings_yield=earnings_yield,
-            earnings_yield_percent=f"{earnings_yield * 100:.2f}%" if earnings_yield else None,
             ebit=ebit,
             # Enterprise Value components
             enterprise_value=enterprise_value,
@@ -474,7 +644,7 @@ async def get_stock_metrics(
             current_long_term_debt=current_long_term_debt,
             long_term_debt=long_term_debt,
             long_term_debt_noncurrent=long_term_debt_noncurrent,
-            notes=notes
+            notes=describe_notes(notes)
         )
 
     except RateLimitError as e:
@@ -2,14 +2,17 @@
 Schwab OAuth Router
 Handles OAuth authentication flow endpoints
 """
+import asyncio
+from functools import lru_cache
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
-from typing import Optional
-from services.schwab_service import SchwabService
-from services.token_manager import TokenManager
+from typing import Optional, TYPE_CHECKING
 from config import settings
 
+if TYPE_CHECKING:
+    from services.schwab_service import SchwabService
+
 
 # Initialize router
 # TODO: Rename router prefix from "/api/v1/oauth" to "/api/v1/schwab" after updating
@@ -17,18 +20,29 @@ from config import settings
 # Schwab has a waiting period before redirect URI changes take effect.
 router = APIRouter(prefix="/api/v1/oauth", tags=["schwab"])
 
-# Initialize token manager and Schwab service
-token_manager = TokenManager(
-    encryption_key=settings.schwab_encryption_key,
-    storage_path="tokens/schwab_tokens.enc"
-)
 
-schwab_service = SchwabService(
-    app_key=settings.schwab_app_key,
-    app_secret=settings.schwab_app_secret,
-    redirect_uri=settings.schwab_redirect_uri,
-    token_manager=token_manager
-)
+@lru_cache(maxsize=1)
+def _svc() -> "SchwabService":
+    """
+    Build the token manager and Schwab service on first use.
+
+    Deferred so the Schwab client and its crypto dependencies are only imported
+    when a Schwab endpoint is actually hit.
+    """
+    from services.schwab_service import SchwabService
+    from services.token_manager import TokenManager
+
+    token_manager = TokenManager(
+        encryption_key=settings.schwab_encryption_key,
+        storage_path="tokens/schwab_tokens.enc"
+    )
+
+    return SchwabService(
+        app_key=settings.schwab_app_key,
+        app_secret=settings.schwab_app_secret,
+        redirect_uri=settings.schwab_redirect_uri,
+        token_manager=token_manager
+    )
 
 
 class ConnectionStatus(BaseModel):
@@ -58,7 +72,7 @@ async def connect():
         Authorization URL for user to visit
     """
     try:
-        auth_url = schwab_service.get_authorization_url()
+        auth_url = _svc().get_authorization_url()
         return {"auth_url": auth_url}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate authorization URL: {str(e)}")
@@ -89,7 +103,7 @@ async def oauth_callback(
 
     try:
         # Exchange code for tokens
-        tokens = schwab_service.exchange_code_for_tokens(code)
+        tokens = await asyncio.to_thread(_svc().exchange_code_for_tokens, code)
 
         # Redirect to frontend with success
         return RedirectResponse(url=f"{settings.frontend_url}/?schwab=connected")
@@ -109,7 +123,8 @@ async def get_status():
         Connection status including token expiration info
     """
     try:
-        tokens = token_manager.get_tokens()
+        token_manager = _svc().token_manager
+        tokens = await asyncio.to_thread(token_manager.get_tokens)
 
         if not tokens:
             return {
@@ -120,8 +135,8 @@ async def get_status():
             }
 
         # Check if tokens are valid
-        is_expired = token_manager.is_access_token_expired()
-        has_refresh = token_manager.is_refresh_token_valid()
+        is_expired = await asyncio.to_thread(token_manager.is_access_token_expired)
+        has_refresh = await asyncio.to_thread(token_manager.is_refresh_token_valid)
 
         if is_expired and not has_refresh:
             return {
@@ -151,7 +166,7 @@ async def disconnect():
         Success message
     """
     try:
-        success = schwab_service.revoke_tokens()
+        success = await asyncio.to_thread(_svc().revoke_tokens)
 
         if success:
             return {"message": "Disconnected from Schwab successfully"}
@@ -171,7 +186,7 @@ async def refresh_token():
         Success message
     """
     try:
-        tokens = schwab_service.refresh_access_token()
+        tokens = await asyncio.to_thread(_svc().refresh_access_token)
         return {
             "message": "Tokens refreshed successfully",
             "expires_at": tokens.get('expires_at')
@@ -192,7 +207,7 @@ async def get_quote(symbol: str):
         Quote data from Schwab
     """
     try:
-        quote = schwab_service.get_quote(symbol.upper())
+        quote = await asyncio.to_thread(_svc().get_quote, symbol.upper())
         return quote
     except Exception as e:
         if "No valid tokens" in str(e):
@@ -212,8 +227,8 @@ async def get_quotes(symbols: str = Query(..., description="Comma-separated stoc
         Quotes data from Schwab
     """
     try:
-        symbol_list = [s.strip().upper() for s in symbols.split(",")]
-        quotes = schwab_service.get_quotes(symbol_list)
+        symbol_list = list(map(str.upper, map(str.strip, symbols.split(","))))
+        quotes = await asyncio.to_thread(_svc().get_quotes, symbol_list)
         return quotes
     except Exception as e:
         if "No valid tokens" in str(e):
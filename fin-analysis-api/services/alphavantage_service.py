@@ -1,49 +1,276 @@
 """Alpha Vantage service for fetching financial data from SEC filings."""
+import logging
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
-from alpha_vantage.fundamentaldata import FundamentalData
+import orjson
+import requests
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import settings
+from services.cache import FileCache
 from services.exceptions import RateLimitError, DataNotFoundError, APIKeyError
 
 
+logger = logging.getLogger(__name__)
+
+# Cache TTLs per data class: statements change at most quarterly,
+# while market cap and share counts drift daily
+STATEMENTS_TTL = 24 * 60 * 60
+DETAILS_TTL = 60 * 60
+
+# Cache key holding (UTC epoch day, request count) for the daily quota
+_DAILY_USAGE_KEY = "daily_usage"
+
+# Token bucket for the 5 requests/minute limit, kept in the disk cache so every
+# worker process on the host draws from the same bucket; idle time refills it,
+# letting up to a full bucket of requests through without waiting
+_RATE_BUCKET_KEY = "rate_bucket"
+_RATE_BUCKET_CAPACITY = 5
+_RATE_BUCKET_REFILL_PER_SECOND = 5 / 60
+
+# Output field -> Alpha Vantage field, per statement
+_INCOME_FIELDS = {
+    "revenues": 'totalRevenue',
+    "operating_income_loss": 'operatingIncome',  # Operating income (EBIT)
+    "ebitda": 'ebitda',
+    "ebit": 'ebit',  # Alpha Vantage has this directly
+    "net_income_loss": 'netIncome',
+    "cost_of_revenue": 'costOfRevenue',
+    "gross_profit": 'grossProfit',
+    "operating_expenses": 'operatingExpenses',
+    "interest_expense": 'interestExpense',
+}
+_BALANCE_FIELDS = {
+    "current_assets": 'totalCurrentAssets',
+    "current_liabilities": 'totalCurrentLiabilities',
+    "fixed_assets": 'propertyPlantEquipment',  # Property, Plant & Equipment
+    "assets": 'totalAssets',
+    "liabilities": 'totalLiabilities',
+    "equity": 'totalShareholderEquity',
+    "cash_and_equivalents": 'cashAndCashEquivalentsAtCarryingValue',
+    # Debt components - return all individual fields for transparency
+    "short_long_term_debt_total": 'shortLongTermDebtTotal',
+    "current_debt": 'currentDebt',
+    "short_term_debt": 'shortTermDebt',
+    "current_long_term_debt": 'currentLongTermDebt',
+    "long_term_debt": 'longTermDebt',
+    "long_term_debt_noncurrent": 'longTermDebtNoncurrent',
+}
+
+# Statement columns read by the extractors; coerced to numbers once per fetch
+_INCOME_COLUMNS = tuple(_INCOME_FIELDS.values())
+_BALANCE_COLUMNS = tuple(_BALANCE_FIELDS.values())
+
+BASE_URL = "https://www.alphavantage.co/query"
+
+# Shared keep-alive session for all Alpha Vantage calls, with retries on transient errors
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+
+def _safe_get(data_dict: Dict, key: str) -> Optional[float]:
+    """
+    Safely get value from dictionary, handling None and missing values.
+
+    Values already parsed to floats (see _numeric_records) are returned as-is.
+
+    Args:
+        data_dict: Dictionary to extract from
+        key: Key to look for
+
+    Returns:
+        Float value or None if not available
+    """
+    value = data_dict.get(key)
+    if type(value) is float:
+        return value
+    if value is None or value == 'None':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _numeric_records(reports: list, columns: tuple) -> list:
+    """
+    Copy report rows with their numeric columns parsed to floats.
+
+    Alpha Vantage reports every value as a string (missing ones as 'None'), so the
+    columns the extractors read are parsed once here; anything unparseable becomes None.
+
+    Args:
+        reports: Report rows from an Alpha Vantage statement response
+        columns: Columns holding numeric values
+
+    Returns:
+        List of row dictionaries
+    """
+    return [{**row, **{col: _safe_get(row, col) for col in columns}} for row in reports]
+
+
+class _InFlight:
+    """A fetch in progress, shared by identical requests that arrive while it runs."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
 class AlphaVantageService:
     """Service class to interact with Alpha Vantage API for fundamental data."""
 
     def __init__(self):
-        self._cache = {}  # Simple cache to avoid repeated requests
-        self._last_request_time = 0
-        self._min_request_interval = 12  # 5 requests/minute = 12 seconds between requests
+        # Persistent cache so restarts don't re-spend the 25/day quota on data we already have
+        self._file_cache = FileCache("alphavantage")
+        # Daily request count and rate bucket, kept on disk for the same reason; unlike the
+        # data cache this is never disabled, since the quota applies regardless
+        self._limits = Cache(os.path.join(settings.cache_dir, "alphavantage-limits"))
         self._daily_request_count = 0
         self._daily_limit = 25  # Free tier limit
-        self._last_reset_date = None
+        self._last_reset_epoch_day = -1
+        # Income statement and balance sheet are independent requests, fetched in parallel
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="alphavantage")
+        # Cache misses currently being fetched, by cache key
+        self._inflight: Dict[str, _InFlight] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _query(self, function: str, symbol: str) -> Dict[str, Any]:
+        """
+        Call the Alpha Vantage query endpoint and decode its JSON response.
+
+        Args:
+            function: Alpha Vantage function name (e.g. 'INCOME_STATEMENT')
+            symbol: Stock ticker symbol
+
+        Returns:
+            Decoded response body
+
+        Raises:
+            ValueError: If no API key is configured or the API returned an error message
+        """
+        if not settings.has_alpha_vantage_key:
+            raise ValueError("Alpha Vantage API key must be provided")
+
+        response = _session.get(
+            BASE_URL,
+            params={"function": function, "symbol": symbol, "apikey": settings.alpha_vantage_api_key},
+            timeout=10
+        )
+        data = orjson.loads(response.content)
+
+        if not data:
+            raise ValueError("Error getting data from the api, no return was given.")
+        # Errors and rate-limit notices come back as 200 responses with a single message field
+        for message_key in ("Error Message", "Information", "Note"):
+            if message_key in data:
+                raise ValueError(data[message_key])
+
+        return data
 
     def _check_daily_limit(self):
         """Check if daily request limit has been reached."""
-        import datetime
-        today = datetime.date.today()
+        # Day number as a plain int, so the common same-day path is one comparison
+        epoch_day = int(time.time() // 86400)
+
+        # Reset the persisted counter on the first check of a new day
+        # (unless another worker already has)
+        if epoch_day != self._last_reset_epoch_day:
+            with self._limits.transact():
+                usage_day, _ = self._limits.get(_DAILY_USAGE_KEY, (None, 0))
+                if usage_day != epoch_day:
+                    self._limits.set(_DAILY_USAGE_KEY, (epoch_day, 0))
+            self._last_reset_epoch_day = epoch_day
 
-        # Reset counter if it's a new day
-        if self._last_reset_date != today:
-            self._daily_request_count = 0
-            self._last_reset_date = today
+        _, self._daily_request_count = self._limits.get(_DAILY_USAGE_KEY, (epoch_day, 0))
 
         # Check if we've hit the limit
         if self._daily_request_count >= self._daily_limit:
             raise Exception(f"Alpha Vantage daily limit of {self._daily_limit} requests reached. Try again tomorrow.")
 
-    def _rate_limit(self):
-        """Implement rate limiting to comply with Alpha Vantage limits."""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
+    def _rate_limit(self, tokens: int = 1):
+        """
+        Take tokens from the shared bucket, sleeping until enough have refilled.
+
+        The bucket lives in the disk cache, so the limit holds across threads
+        and across worker processes sharing the cache directory.
+
+        Args:
+            tokens: Number of API requests about to be made
+        """
+        while True:
+            with self._limits.transact():
+                now = time.time()
+                available, updated_at = self._limits.get(_RATE_BUCKET_KEY, (_RATE_BUCKET_CAPACITY, now))
+                available = min(
+                    _RATE_BUCKET_CAPACITY,
+                    available + (now - updated_at) * _RATE_BUCKET_REFILL_PER_SECOND
+                )
+
+                if available >= tokens:
+                    self._limits.set(_RATE_BUCKET_KEY, (available - tokens, now))
+                    return
 
-        if time_since_last_request < self._min_request_interval:
-            time.sleep(self._min_request_interval - time_since_last_request)
+                self._limits.set(_RATE_BUCKET_KEY, (available, now))
+                wait = (tokens - available) / _RATE_BUCKET_REFILL_PER_SECOND
 
-        self._last_request_time = time.time()
+            time.sleep(wait)
 
     def _increment_request_count(self):
-        """Increment the daily request counter."""
-        self._daily_request_count += 1
+        """Increment the daily request counter (persisted so it survives restarts)."""
+        with self._limits.transact():
+            usage_date, count = self._limits.get(_DAILY_USAGE_KEY, (self._last_reset_epoch_day, 0))
+            self._daily_request_count = count + 1
+            self._limits.set(_DAILY_USAGE_KEY, (usage_date, self._daily_request_count))
+
+    def _coalesced(self, cache_key: str, fetch, *args):
+        """
+        Run fetch(*args), or wait for an identical fetch already in flight and share its outcome.
+
+        Concurrent cache misses for the same key would otherwise each spend rate-limit
+        tokens and daily quota on the same data.
+
+        Args:
+            cache_key: Cache key of the data being fetched
+            fetch: Function that fetches (and caches) the data
+            *args: Arguments for fetch
+
+        Returns:
+            The result of fetch; its exception is raised to every waiting caller
+        """
+        with self._inflight_lock:
+            inflight = self._inflight.get(cache_key)
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight[cache_key] = _InFlight()
+
+        if not leader:
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.result
+
+        try:
+            inflight.result = fetch(*args)
+            return inflight.result
+        except Exception as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+            inflight.done.set()
 
     def get_financials(
         self,
@@ -59,72 +286,88 @@ class AlphaVantageService:
             timeframe: 'annual' or 'quarterly'
             limit: Number of periods to retrieve
 
+        Returns:
+            List of financial data or None if not found
+        """
+        # Normalize once; the cache key must not depend on the caller's casing
+        symbol = ticker.upper()
+
+        # Check cache first
+        cache_key = f"{symbol}_{timeframe}_{limit}"
+        cached = self._file_cache.get(FileCache.make_key(cache_key))
+        if cached is not None:
+            return cached
+
+        return self._coalesced(cache_key, self._fetch_financials, cache_key, symbol, timeframe, limit)
+
+    def _fetch_financials(self, cache_key: str, ticker: str, timeframe: str, limit: int) -> Optional[list]:
+        """
+        Fetch financial statements from the API and cache them.
+
+        Args:
+            cache_key: Cache key for the results
+            ticker: Upper-case stock ticker symbol
+            timeframe: 'annual' or 'quarterly'
+            limit: Number of periods to retrieve
+
         Returns:
             List of financial data or None if not found
         """
         try:
-            # Check cache first
-            cache_key = f"{ticker}_{timeframe}_{limit}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
+            # An identical fetch may have finished since the caller's cache miss
+            cached = self._file_cache.get(FileCache.make_key(cache_key))
+            if cached is not None:
+                return cached
 
             # Check daily limit
             self._check_daily_limit()
 
-            # Rate limit
-            self._rate_limit()
+            # Rate limit (income statement + balance sheet)
+            self._rate_limit(2)
 
-            # Initialize Alpha Vantage client
-            fd = FundamentalData(key=settings.alpha_vantage_api_key, output_format='pandas')
-
-            # Get income statement and balance sheet
-            if timeframe == "annual":
-                income_df, _ = fd.get_income_statement_annual(symbol=ticker.upper())
-                balance_df, _ = fd.get_balance_sheet_annual(symbol=ticker.upper())
-            else:  # quarterly
-                income_df, _ = fd.get_income_statement_quarterly(symbol=ticker.upper())
-                balance_df, _ = fd.get_balance_sheet_quarterly(symbol=ticker.upper())
+            # Get income statement and balance sheet concurrently
+            income_future = self._executor.submit(self._query, "INCOME_STATEMENT", ticker)
+            balance_future = self._executor.submit(self._query, "BALANCE_SHEET", ticker)
+            income_data = income_future.result()
+            balance_data = balance_future.result()
 
             # Increment request count (2 requests made: income + balance)
             self._increment_request_count()
             self._increment_request_count()
 
+            # Statements come back as lists of per-period reports, most recent first
+            reports_key = "annualReports" if timeframe == "annual" else "quarterlyReports"
+            income_reports = income_data.get(reports_key)
+            balance_reports = balance_data.get(reports_key)
+
             # Check if data is available
-            if income_df.empty or balance_df.empty:
+            if not income_reports or not balance_reports:
                 raise DataNotFoundError(
                     f"No financial data available for ticker {ticker}",
                     provider="alphavantage"
                 )
 
-            # Alpha Vantage returns DataFrames with rows as periods and columns as fields
-            # Convert to our format (list of periods)
-            results = []
-
-            # Get up to 'limit' periods (rows are periods)
-            num_periods = min(limit, len(income_df))
-
-            for i in range(num_periods):
-                # Get the date for this period from the fiscalDateEnding column
-                fiscal_date = income_df.iloc[i]['fiscalDateEnding']
+            income_rows = _numeric_records(income_reports[:limit], _INCOME_COLUMNS)
+            balance_rows = _numeric_records(balance_reports[:limit], _BALANCE_COLUMNS)
 
-                # Convert DataFrame row to dictionary
-                income_dict = income_df.iloc[i].to_dict()
-                balance_dict = balance_df.iloc[i].to_dict()
-
-                period_data = {
-                    "end_date": fiscal_date,
+            # Convert to our format (list of periods)
+            results = [
+                {
+                    "end_date": income.get('fiscalDateEnding'),
                     "fiscal_period": "FY" if timeframe == "annual" else f"Q{((i % 4) + 1)}",
-                    "fiscal_year": fiscal_date.split('-')[0] if fiscal_date else None,  # Extract year from date
+                    # Extract year from date
+                    "fiscal_year": income['fiscalDateEnding'].split('-')[0] if income.get('fiscalDateEnding') else None,
                     "financials": {
-                        "income_statement": income_dict,
-                        "balance_sheet": balance_dict
+                        "income_statement": income,
+                        "balance_sheet": balance
                     }
                 }
-                results.append(period_data)
+                for i, (income, balance) in enumerate(zip(income_rows, balance_rows))
+            ]
 
             # Cache the results
             if results:
-                self._cache[cache_key] = results
+                self._file_cache.set(FileCache.make_key(cache_key), results, ttl=STATEMENTS_TTL)
 
             return results if results else None
 
@@ -151,49 +394,80 @@ class AlphaVantageService:
                 )
 
             # Generic error - include the original message
-            print(f"Error fetching financials from Alpha Vantage for {ticker}: {e}")
+            logger.warning("Error fetching financials from Alpha Vantage for %s: %s", ticker, e)
             raise DataNotFoundError(
                 f"Alpha Vantage error for {ticker}: {str(e)}",
                 provider="alphavantage",
                 original_error=e
             )
 
-    def extract_income_statement(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_financials_batch(
+        self,
+        tickers: list[str],
+        timeframe: str = "annual",
+        limit: int = 1
+    ) -> Dict[str, Optional[list]]:
         """
-        Extract income statement fields from Alpha Vantage financial data.
+        Get financial statements for several tickers concurrently.
+
+        Every uncached fetch still goes through the shared rate limiter, so the
+        5 requests/minute budget holds; cached tickers return immediately and
+        network round-trips overlap with the limiter's waits.
+
+        Args:
+            tickers: Stock ticker symbols
+            timeframe: 'annual' or 'quarterly'
+            limit: Number of periods to retrieve per ticker
+
+        Returns:
+            Dictionary mapping each ticker to its financial data list, or None if no data was found
+
+        Raises:
+            RateLimitError, APIKeyError: These need user attention, so they abort the batch
+        """
+        def fetch(ticker: str) -> Optional[list]:
+            try:
+                return self.get_financials(ticker, timeframe, limit)
+            except DataNotFoundError as e:
+                logger.warning("No Alpha Vantage financials for %s in batch: %s", ticker, e.message)
+                return None
+
+        with ThreadPoolExecutor(max_workers=5, thread_name_prefix="alphavantage-batch") as pool:
+            return dict(zip(tickers, pool.map(fetch, tickers)))
+
+    def _extract(self, financial_data: Dict[str, Any], statement: str, fields: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Map one statement of a period onto our field names.
 
         Args:
             financial_data: Raw financial data from Alpha Vantage
+            statement: Statement key under "financials"
+            fields: Output field -> Alpha Vantage field mapping
 
         Returns:
-            Extracted income statement fields
+            Period header fields plus the mapped statement fields
         """
-        income_statement = financial_data.get("financials", {}).get("income_statement", {})
+        src = financial_data.get("financials", {}).get(statement, {})
 
         return {
             "date": financial_data.get("end_date"),
             "fiscal_period": financial_data.get("fiscal_period"),
             "fiscal_year": financial_data.get("fiscal_year"),
-            # Revenue fields
-            "revenues": self._safe_get(income_statement, 'totalRevenue'),
-            # Operating income (EBIT)
-            "operating_income_loss": self._safe_get(income_statement, 'operatingIncome'),
-            # EBITDA
-            "ebitda": self._safe_get(income_statement, 'ebitda'),
-            # EBIT (Alpha Vantage has this directly!)
-            "ebit": self._safe_get(income_statement, 'ebit'),
-            # Net income
-            "net_income_loss": self._safe_get(income_statement, 'netIncome'),
-            # Cost of revenue
-            "cost_of_revenue": self._safe_get(income_statement, 'costOfRevenue'),
-            # Gross profit
-            "gross_profit": self._safe_get(income_statement, 'grossProfit'),
-            # Operating expenses
-            "operating_expenses": self._safe_get(income_statement, 'operatingExpenses'),
-            # Interest expense
-            "interest_expense": self._safe_get(income_statement, 'interestExpense'),
+            **{out: _safe_get(src, key) for out, key in fields.items()},
         }
 
+    def extract_income_statement(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract income statement fields from Alpha Vantage financial data.
+
+        Args:
+            financial_data: Raw financial data from Alpha Vantage
+
+        Returns:
+            Extracted income statement fields
+        """
+        return self._extract(financial_data, "income_statement", _INCOME_FIELDS)
+
     def extract_balance_sheet(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract balance sheet fields from Alpha Vantage financial data.
@@ -204,36 +478,7 @@ class AlphaVantageService:
         Returns:
             Extracted balance sheet fields
         """
-        balance_sheet = financial_data.get("financials", {}).get("balance_sheet", {})
-
-        print(f'HEREEE: {balance_sheet}')
-
-        return {
-            "date": financial_data.get("end_date"),
-            "fiscal_period": financial_data.get("fiscal_period"),
-            "fiscal_year": financial_data.get("fiscal_year"),
-            # Current assets
-            "current_assets": self._safe_get(balance_sheet, 'totalCurrentAssets'),
-            # Current liabilities
-            "current_liabilities": self._safe_get(balance_sheet, 'totalCurrentLiabilities'),
-            # Fixed assets (Property, Plant & Equipment)
-            "fixed_assets": self._safe_get(balance_sheet, 'propertyPlantEquipment'),
-            # Total assets
-            "assets": self._safe_get(balance_sheet, 'totalAssets'),
-            # Total liabilities
-            "liabilities": self._safe_get(balance_sheet, 'totalLiabilities'),
-            # Equity (Shareholder equity)
-            "equity": self._safe_get(balance_sheet, 'totalShareholderEquity'),
-            # Cash and equivalents
-            "cash_and_equivalents": self._safe_get(balance_sheet, 'cashAndCashEquivalentsAtCarryingValue'),
-            # Debt components - return all individual fields for transparency
-            "short_long_term_debt_total": self._safe_get(balance_sheet, 'shortLongTermDebtTotal'),
-            "current_debt": self._safe_get(balance_sheet, 'currentDebt'),
-            "short_term_debt": self._safe_get(balance_sheet, 'shortTermDebt'),
-            "current_long_term_debt": self._safe_get(balance_sheet, 'currentLongTermDebt'),
-            "long_term_debt": self._safe_get(balance_sheet, 'longTermDebt'),
-            "long_term_debt_noncurrent": self._safe_get(balance_sheet, 'longTermDebtNoncurrent'),
-        }
+        return self._extract(financial_data, "balance_sheet", _BALANCE_FIELDS)
 
     def get_ticker_details(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -242,14 +487,35 @@ class AlphaVantageService:
         Args:
             ticker: Stock ticker symbol
 
+        Returns:
+            Dictionary with ticker details or None if not found
+        """
+        symbol = ticker.upper()
+
+        # Check cache first
+        cache_key = f"details_{symbol}"
+        cached = self._file_cache.get(FileCache.make_key(cache_key))
+        if cached is not None:
+            return cached
+
+        return self._coalesced(cache_key, self._fetch_ticker_details, cache_key, symbol)
+
+    def _fetch_ticker_details(self, cache_key: str, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch ticker details from the API and cache them.
+
+        Args:
+            cache_key: Cache key for the result
+            ticker: Upper-case stock ticker symbol
+
         Returns:
             Dictionary with ticker details or None if not found
         """
         try:
-            # Check cache first
-            cache_key = f"details_{ticker}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
+            # An identical fetch may have finished since the caller's cache miss
+            cached = self._file_cache.get(FileCache.make_key(cache_key))
+            if cached is not None:
+                return cached
 
             # Check daily limit
             self._check_daily_limit()
@@ -257,59 +523,29 @@ class AlphaVantageService:
             # Rate limit
             self._rate_limit()
 
-            # Initialize Alpha Vantage client
-            fd = FundamentalData(key=settings.alpha_vantage_api_key, output_format='pandas')
-
             # Get company overview
-            overview_df, _ = fd.get_company_overview(symbol=ticker.upper())
+            overview = self._query("OVERVIEW", ticker)
 
             # Increment request count
             self._increment_request_count()
 
-            # Check if data is available
-            if overview_df.empty:
-                return None
-
-            # Convert to dictionary (overview returns a single-row DataFrame)
-            overview = overview_df.to_dict('records')[0] if len(overview_df) > 0 else {}
-
             # Extract market cap and shares
-            market_cap = self._safe_get(overview, 'MarketCapitalization')
-            shares_outstanding = self._safe_get(overview, 'SharesOutstanding')
+            market_cap = _safe_get(overview, 'MarketCapitalization')
+            shares_outstanding = _safe_get(overview, 'SharesOutstanding')
 
             result = {
-                "ticker": ticker.upper(),
+                "ticker": ticker,
                 "market_cap": market_cap,
                 "share_class_shares_outstanding": shares_outstanding,
                 "weighted_shares_outstanding": shares_outstanding,
             }
 
             # Cache the result
-            self._cache[cache_key] = result
+            self._file_cache.set(FileCache.make_key(cache_key), result, ttl=DETAILS_TTL)
             return result
 
         except Exception as e:
-            print(f"Error fetching ticker details from Alpha Vantage for {ticker}: {e}")
-            return None
-
-    @staticmethod
-    def _safe_get(data_dict: Dict, key: str) -> Optional[float]:
-        """
-        Safely get value from dictionary, handling None and missing values.
-
-        Args:
-            data_dict: Dictionary to extract from
-            key: Key to look for
-
-        Returns:
-            Float value or None if not available
-        """
-        try:
-            value = data_dict.get(key)
-            if value is None or value == 'None':
-                return None
-            return float(value)
-        except (TypeError, ValueError, KeyError):
+            logger.warning("Error fetching ticker details from Alpha Vantage for %s: %s", ticker, e)
             return None
 
 
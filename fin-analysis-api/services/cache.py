@@ -0,0 +1,64 @@
+"""Persistent on-disk cache for provider responses."""
+import hashlib
+import os
+from typing import Any, Optional
+from diskcache import Cache
+from config import settings
+
+
+class FileCache:
+    """
+    Key/value cache with per-entry TTLs that survives process restarts.
+
+    Each namespace gets its own directory under the configured cache_dir.
+    With CACHE_DISABLE set, every lookup misses and writes are dropped.
+    """
+
+    def __init__(self, namespace: str):
+        """
+        Initialize the cache
+
+        Args:
+            namespace: Subdirectory of cache_dir holding this cache's entries
+        """
+        self.enabled = not settings.cache_disable
+        self._cache = Cache(os.path.join(settings.cache_dir, namespace)) if self.enabled else None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a fixed-length key from request parts (e.g. endpoint, ticker, timeframe, limit).
+
+        Args:
+            *parts: Values identifying the request
+
+        Returns:
+            Hex digest of the parts joined with ':'
+        """
+        return hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing, expired or caching is disabled
+        """
+        if not self.enabled:
+            return None
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to store (must be picklable)
+            ttl: Seconds until the entry expires, or None to keep it until evicted
+        """
+        if self.enabled:
+            self._cache.set(key, value, expire=ttl)
@@ -1,5 +1,8 @@
 """Hybrid financial data service that supports Polygon, yfinance, and Alpha Vantage."""
-from typing import Optional, Dict, Any, Literal
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from functools import lru_cache
+from typing import Callable, Optional, Dict, Any, Literal
 from services.polygon_service import polygon_service
 from services.yfinance_service import yfinance_service
 from services.alphavantage_service import alphavantage_service
@@ -7,8 +10,13 @@ from services.exceptions import RateLimitError, DataNotFoundError, APIKeyError,
 from config import settings
 
 
+logger = logging.getLogger(__name__)
+
 ProviderType = Literal["polygon", "yfinance", "alphavantage"]
 
+# How long the primary provider gets before yfinance is raced against it
+HEDGE_DELAY = 0.2
+
 
 class FinancialDataService:
     """
@@ -21,6 +29,33 @@ class FinancialDataService:
         self.polygon = polygon_service
         self.yfinance = yfinance_service
         self.alphavantage = alphavantage_service
+        self._services = {
+            "polygon": self.polygon,
+            "yfinance": self.yfinance,
+            "alphavantage": self.alphavantage,
+        }
+
+        # Extractor dispatch tables, keyed by resolved provider name
+        self._income_extractors = {name: svc.extract_income_statement for name, svc in self._services.items()}
+        self._balance_extractors = {name: svc.extract_balance_sheet for name, svc in self._services.items()}
+
+        # Provider resolution depends only on settings, which are fixed for the process lifetime;
+        # memoize it per instance (bounded, since provider names come from query strings)
+        self._resolve_provider = lru_cache(maxsize=8)(self._resolve_provider)
+
+        # Run hedged provider calls, so a slow loser never blocks the caller. Primaries and
+        # yfinance hedges get separate pools: a primary can sit in its provider's rate limiter
+        # for up to a minute, and must never leave the hedges queued behind it
+        self._primary_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider-primary")
+        self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider-hedge")
+
+    def warmup(self):
+        """
+        Prepare provider clients before the app starts serving requests.
+
+        yfinance is always warmed since it is the default and the fallback provider.
+        """
+        self.yfinance.warmup()
 
     def _get_default_provider(self) -> ProviderType:
         """
@@ -42,15 +77,18 @@ class FinancialDataService:
         # Use it as default for personal, infrequent use
         return "yfinance"
 
-    def _get_service(self, provider: Optional[str] = None):
+    def _resolve_provider(self, provider: Optional[str] = None) -> ProviderType:
         """
-        Get the appropriate service instance.
+        Resolve the provider that will actually serve a request.
+
+        Providers without a configured API key resolve to yfinance, and unknown
+        providers resolve to the default.
 
         Args:
             provider: Optional provider name ('polygon', 'yfinance', or 'alphavantage')
 
         Returns:
-            Service instance (polygon_service, yfinance_service, or alphavantage_service)
+            Provider name that should be used
         """
         if provider is None:
             provider = self._get_default_provider()
@@ -59,19 +97,117 @@ class FinancialDataService:
 
         if provider_lower == "polygon":
             if not settings.has_polygon_key:
-                print("Warning: Polygon provider requested but no API key configured. Falling back to yfinance.")
-                return self.yfinance
-            return self.polygon
+                logger.warning("Polygon provider requested but no API key configured. Falling back to yfinance.")
+                return "yfinance"
+            return "polygon"
         elif provider_lower == "alphavantage":
             if not settings.has_alpha_vantage_key:
-                print("Warning: Alpha Vantage provider requested but no API key configured. Falling back to yfinance.")
-                return self.yfinance
-            return self.alphavantage
+                logger.warning("Alpha Vantage provider requested but no API key configured. Falling back to yfinance.")
+                return "yfinance"
+            return "alphavantage"
         elif provider_lower == "yfinance":
-            return self.yfinance
+            return "yfinance"
         else:
-            print(f"Warning: Unknown provider '{provider}'. Using default.")
-            return self._get_service(None)
+            logger.warning("Unknown provider '%s'. Using default.", provider)
+            return self._resolve_provider(None)
+
+    def _get_service(self, provider: Optional[str] = None):
+        """
+        Get the appropriate service instance.
+
+        Args:
+            provider: Optional provider name ('polygon', 'yfinance', or 'alphavantage')
+
+        Returns:
+            Service instance (polygon_service, yfinance_service, or alphavantage_service)
+        """
+        return self._services[self._resolve_provider(provider)]
+
+    def _should_hedge(self, selected_provider: str) -> bool:
+        """
+        Whether to race yfinance against the selected provider.
+
+        Alpha Vantage is never hedged: its requests count against a small daily quota,
+        so it is only fallen back from sequentially.
+        """
+        return settings.enable_fallback and selected_provider not in ("yfinance", "alphavantage")
+
+    def _get_financials_hedged(
+        self,
+        ticker: str,
+        selected_provider: str,
+        fetch: Callable[[Any], Optional[list]]
+    ) -> Optional[tuple[list, str]]:
+        """
+        Fetch from the selected provider, racing yfinance against it if it is slow.
+
+        The primary gets HEDGE_DELAY seconds on its own; after that yfinance is
+        started too and the first non-empty result wins. The loser is cancelled if
+        it has not started (a running request is left to finish and discarded).
+
+        Args:
+            ticker: Stock ticker symbol
+            selected_provider: Resolved primary provider
+            fetch: Calls get_financials on the service it is given
+
+        Returns:
+            Tuple of (financial data list, provider used) or (None, None) if both found nothing
+
+        Raises:
+            RateLimitError, APIKeyError: From the primary, as these need user attention
+            DataNotFoundError, FinancialDataError: If the primary failed and yfinance found nothing
+        """
+        primary = self._primary_executor.submit(fetch, self._services[selected_provider])
+        futures = {primary: selected_provider}
+
+        try:
+            data = primary.result(timeout=HEDGE_DELAY)
+            if data:
+                return data, selected_provider
+        except FutureTimeoutError:
+            logger.warning("%s is slow for %s. Racing yfinance against it.", selected_provider, ticker)
+        except (RateLimitError, APIKeyError):
+            raise
+        except Exception:
+            # Surfaced below once the fallback has had its turn
+            pass
+
+        futures[self._hedge_executor.submit(fetch, self.yfinance)] = "yfinance"
+        primary_error = None
+
+        for future in as_completed(futures):
+            provider_used = futures[future]
+            try:
+                data = future.result()
+            except (RateLimitError, APIKeyError) as e:
+                if future is primary:
+                    logger.warning("Error with %s: %s", selected_provider, e.message)
+                    raise
+                logger.warning("Fallback to yfinance also failed: %s", e)
+                continue
+            except Exception as e:
+                if future is primary:
+                    logger.warning("Error with %s: %s", selected_provider, e)
+                    primary_error = e
+                else:
+                    logger.warning("Fallback to yfinance also failed: %s", e)
+                continue
+
+            if data:
+                for other in futures:
+                    other.cancel()
+                return data, provider_used
+
+        if isinstance(primary_error, DataNotFoundError):
+            raise primary_error
+        if primary_error is not None:
+            raise FinancialDataError(
+                f"Failed to get financials for {ticker}: {str(primary_error)}",
+                provider=selected_provider,
+                original_error=primary_error
+            )
+
+        return None, None
 
     def get_financials(
         self,
@@ -93,8 +229,15 @@ class FinancialDataService:
             Tuple of (financial data list, provider used) or (None, None) if failed
         """
         # Determine which provider to use
-        selected_provider = provider if provider else self._get_default_provider()
-        service = self._get_service(selected_provider)
+        selected_provider = self._resolve_provider(provider)
+        service = self._services[selected_provider]
+
+        if self._should_hedge(selected_provider):
+            return self._get_financials_hedged(
+                ticker,
+                selected_provider,
+                lambda svc: svc.get_financials(ticker, timeframe, limit)
+            )
 
         try:
             data = service.get_financials(ticker, timeframe, limit)
@@ -104,7 +247,7 @@ class FinancialDataService:
 
             # If primary provider returned None and fallback is enabled
             if settings.enable_fallback and selected_provider != "yfinance":
-                print(f"{selected_provider} returned no data. Falling back to yfinance.")
+                logger.warning("%s returned no data. Falling back to yfinance.", selected_provider)
                 fallback_data = self.yfinance.get_financials(ticker, timeframe, limit)
                 if fallback_data:
                     return fallback_data, "yfinance"
@@ -113,21 +256,21 @@ class FinancialDataService:
 
         except (RateLimitError, APIKeyError) as e:
             # Don't fallback on rate limit or API key errors - these need user attention
-            print(f"Error with {selected_provider}: {e.message}")
+            logger.warning("Error with %s: %s", selected_provider, e.message)
             raise
 
         except DataNotFoundError as e:
             # Data not found - try fallback if enabled
-            print(f"Data not found with {selected_provider}: {e.message}")
+            logger.warning("Data not found with %s: %s", selected_provider, e.message)
 
             if settings.enable_fallback and selected_provider != "yfinance":
-                print(f"Falling back to yfinance due to data not found.")
+                logger.warning("Falling back to yfinance due to data not found.")
                 try:
                     fallback_data = self.yfinance.get_financials(ticker, timeframe, limit)
                     if fallback_data:
                         return fallback_data, "yfinance"
                 except Exception as fallback_error:
-                    print(f"Fallback to yfinance also failed: {fallback_error}")
+                    logger.warning("Fallback to yfinance also failed: %s", fallback_error)
                     # Re-raise the original DataNotFoundError if fallback also fails
                     raise e
 
@@ -135,17 +278,17 @@ class FinancialDataService:
             raise
 
         except Exception as e:
-            print(f"Unexpected error with {selected_provider}: {e}")
+            logger.warning("Unexpected error with %s: %s", selected_provider, e)
 
             # Fallback to yfinance if enabled and not already using it
             if settings.enable_fallback and selected_provider != "yfinance":
-                print(f"Falling back to yfinance due to {selected_provider} error.")
+                logger.warning("Falling back to yfinance due to %s error.", selected_provider)
                 try:
                     fallback_data = self.yfinance.get_financials(ticker, timeframe, limit)
                     if fallback_data:
                         return fallback_data, "yfinance"
                 except Exception as fallback_error:
-                    print(f"Fallback to yfinance also failed: {fallback_error}")
+                    logger.warning("Fallback to yfinance also failed: %s", fallback_error)
 
             # Wrap unknown errors in FinancialDataError
             raise FinancialDataError(
@@ -169,8 +312,10 @@ class FinancialDataService:
         Returns:
             Extracted income statement data
         """
-        service = self._get_service(provider)
-        return service.extract_income_statement(financial_data)
+        extractor = self._income_extractors.get(provider)
+        if extractor is None:
+            extractor = self._get_service(provider).extract_income_statement
+        return extractor(financial_data)
 
     def extract_balance_sheet(
         self,
@@ -187,8 +332,10 @@ class FinancialDataService:
         Returns:
             Extracted balance sheet data
         """
-        service = self._get_service(provider)
-        return service.extract_balance_sheet(financial_data)
+        extractor = self._balance_extractors.get(provider)
+        if extractor is None:
+            extractor = self._get_service(provider).extract_balance_sheet
+        return extractor(financial_data)
 
     def get_ticker_details(
         self,
@@ -205,8 +352,8 @@ class FinancialDataService:
         Returns:
             Tuple of (ticker details dict, provider used) or (None, None) if failed
         """
-        selected_provider = provider if provider else self._get_default_provider()
-        service = self._get_service(selected_provider)
+        selected_provider = self._resolve_provider(provider)
+        service = self._services[selected_provider]
 
         try:
             data = service.get_ticker_details(ticker)
@@ -216,7 +363,7 @@ class FinancialDataService:
 
             # Fallback to yfinance if enabled
             if settings.enable_fallback and selected_provider != "yfinance":
-                print(f"{selected_provider} ticker details failed. Falling back to yfinance.")
+                logger.warning("%s ticker details failed. Falling back to yfinance.", selected_provider)
                 fallback_data = self.yfinance.get_ticker_details(ticker)
                 if fallback_data:
                     return fallback_data, "yfinance"
@@ -225,11 +372,11 @@ class FinancialDataService:
 
         except (RateLimitError, APIKeyError) as e:
             # Don't fallback on rate limit or API key errors
-            print(f"Error getting ticker details with {selected_provider}: {e.message}")
+            logger.warning("Error getting ticker details with %s: %s", selected_provider, e.message)
             raise
 
         except DataNotFoundError as e:
-            print(f"Ticker details not found with {selected_provider}: {e.message}")
+            logger.warning("Ticker details not found with %s: %s", selected_provider, e.message)
 
             # Try fallback if enabled
             if settings.enable_fallback and selected_provider != "yfinance":
@@ -238,13 +385,13 @@ class FinancialDataService:
                     if fallback_data:
                         return fallback_data, "yfinance"
                 except Exception as fallback_error:
-                    print(f"Fallback ticker details also failed: {fallback_error}")
+                    logger.warning("Fallback ticker details also failed: %s", fallback_error)
                     raise e
 
             raise
 
         except Exception as e:
-            print(f"Unexpected error getting ticker details with {selected_provider}: {e}")
+            logger.warning("Unexpected error getting ticker details with %s: %s", selected_provider, e)
 
             # Fallback to yfinance if enabled
             if settings.enable_fallback and selected_provider != "yfinance":
@@ -253,7 +400,7 @@ class FinancialDataService:
                     if fallback_data:
                         return fallback_data, "yfinance"
                 except Exception as fallback_error:
-                    print(f"Fallback ticker details also failed: {fallback_error}")
+                    logger.warning("Fallback ticker details also failed: %s", fallback_error)
 
             raise FinancialDataError(
                 f"Failed to get ticker details for {ticker}: {str(e)}",
@@ -1,8 +1,157 @@
+import logging
+import threading
+import time
+import orjson
 import requests
+from collections import deque
+from operator import attrgetter
 from typing import Optional, Dict, Any
+from cachetools import TTLCache, cachedmethod
+from cachetools.keys import hashkey
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import settings
+from services.cache import FileCache
 from services.exceptions import RateLimitError, DataNotFoundError, APIKeyError, FinancialDataError
 
+logger = logging.getLogger(__name__)
+
+# Cache TTLs per data class: statements only change when a new period is reported,
+# ratios carry price-based fields, and market cap moves intraday
+FINANCIALS_TTL = 90 * 24 * 60 * 60
+RATIOS_TTL = 30 * 24 * 60 * 60
+DETAILS_TTL = 15 * 60
+
+
+class _RateLimiter:
+    """
+    Sliding-window rate limiter: at most max_calls requests in any period seconds.
+
+    Thread-safe, so concurrent requests draw from the same per-key budget.
+    """
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Record a request if the window has room; otherwise return the seconds until it will."""
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+
+            if len(self._calls) < self.max_calls:
+                self._calls.append(now)
+                return 0.0
+
+            return self.period - (now - self._calls[0])
+
+    def acquire(self):
+        """Block until a request may be made."""
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+
+
+# Statement fields copied straight from Polygon's schema (each holds a {"value": ...} entry)
+_INCOME_FIELDS = (
+    "revenues",
+    "operating_income_loss",  # Operating income (EBIT - Earnings Before Interest and Taxes)
+    "ebitda",
+    "net_income_loss",
+    "cost_of_revenue",
+    "gross_profit",
+    "operating_expenses",
+    "interest_expense",  # For reference
+)
+_COMPREHENSIVE_INCOME_FIELDS = ("comprehensive_income_loss",)
+
+# Output field -> Polygon balance sheet field
+_BALANCE_FIELDS = {
+    "current_assets": "current_assets",
+    "current_liabilities": "current_liabilities",
+    "fixed_assets": "fixed_assets",  # Property, Plant & Equipment
+    "assets": "assets",
+    "liabilities": "liabilities",
+    "equity": "equity",
+    # Debt components - extract all individual fields for transparency
+    # No fallbacks - just return what Polygon provides
+    "current_debt": "debt_current",
+    "short_term_debt": "short_term_debt",
+    "current_long_term_debt": "current_long_term_debt",
+    "long_term_debt": "long_term_debt",
+    "long_term_debt_noncurrent": "long_term_debt_noncurrent",
+}
+
+# Candidate Polygon fields for values reported under different names, in order of preference
+_CASH_KEYS = ("cash_and_equivalents", "cash_and_short_term_investments", "cash")
+_DEBT_KEYS = ("short_long_term_debt_total", "total_debt")
+
+
+def _first_value(statement: Dict[str, Any], keys: tuple) -> Optional[float]:
+    """
+    Get the value of the first of several candidate fields that has one.
+
+    Args:
+        statement: Polygon statement section (e.g. the balance sheet)
+        keys: Candidate field names, in order of preference
+
+    Returns:
+        First non-None value, or None if no candidate has one
+    """
+    for key in keys:
+        entry = statement.get(key)
+        if entry is not None and entry.get("value") is not None:
+            return entry["value"]
+    return None
+
+
+def _period_header(financial_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Period fields shared by every extracted statement."""
+    return {
+        "date": financial_data.get("end_date"),
+        "fiscal_period": financial_data.get("fiscal_period"),
+        "fiscal_year": financial_data.get("fiscal_year"),
+    }
+
+
+def _income_values(income_statement: Dict[str, Any]) -> Dict[str, Any]:
+    """Income statement values from a Polygon income_statement section."""
+    return {field: (income_statement.get(field) or {}).get("value") for field in _INCOME_FIELDS}
+
+
+def _balance_values(balance_sheet: Dict[str, Any]) -> Dict[str, Any]:
+    """Balance sheet values from a Polygon balance_sheet section."""
+    return {
+        **{out: (balance_sheet.get(field) or {}).get("value") for out, field in _BALANCE_FIELDS.items()},
+        # Cash and equivalents (try multiple field names from Polygon's schema)
+        "cash_and_equivalents": _first_value(balance_sheet, _CASH_KEYS),
+        "short_long_term_debt_total": _first_value(balance_sheet, _DEBT_KEYS),
+    }
+
+
+def _comprehensive_income_values(comprehensive_income: Dict[str, Any]) -> Dict[str, Any]:
+    """Comprehensive income values from a Polygon comprehensive_income section."""
+    return {
+        field: (comprehensive_income.get(field) or {}).get("value") for field in _COMPREHENSIVE_INCOME_FIELDS
+    }
+
+
+# Paces requests below the plan limit instead of running into 429s
+_rate_limiter = _RateLimiter(settings.polygon_requests_per_minute, 60)
+
+
+def _statement_key(self, ticker: str, timeframe: str = "annual", limit: int = 1):
+    """Cache key for per-ticker statement requests, independent of ticker casing."""
+    return hashkey(ticker.upper(), timeframe, limit)
+
+
+def _details_key(self, ticker: str):
+    """Cache key for ticker details, independent of ticker casing."""
+    return hashkey(ticker.upper())
+
 
 class PolygonService:
     """Service class to interact with Polygon.io API."""
@@ -10,7 +159,65 @@ class PolygonService:
     def __init__(self):
         self.api_key = settings.polygon_api_key
         self.base_url = "https://api.polygon.io"
+        self._financials_url = f"{self.base_url}/vX/reference/financials"
+        self._ratios_url = f"{self.base_url}/vX/reference/ratios"
+        self._tickers_url = f"{self.base_url}/v3/reference/tickers/"
+
+        # Reused keep-alive session so each call skips the TCP+TLS handshake. The default
+        # Accept-Encoding (gzip, deflate) is left in place: statement JSON compresses ~5-10x
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/json",
+            "User-Agent": "fin-analysis-api",
+        })
+        # Sent with every request, so per-call params only carry what varies
+        self.session.params = {"apiKey": self.api_key}
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                allowed_methods=frozenset(["GET"]),
+                # Hand back the last response once retries run out, so raise_for_status
+                # still maps a persistent 429 to RateLimitError
+                raise_on_status=False
+            )
+        ))
 
+        # In-memory response caches; only successful responses are stored
+        self._financials_cache = TTLCache(maxsize=512, ttl=FINANCIALS_TTL)
+        self._ratios_cache = TTLCache(maxsize=512, ttl=RATIOS_TTL)
+        self._details_cache = TTLCache(maxsize=1024, ttl=DETAILS_TTL)
+        self._cache_lock = threading.Lock()
+
+        # Persistent cache under the in-memory ones, so restarts don't re-fetch reported data
+        self._file_cache = FileCache("polygon")
+
+    def _rate_limited_get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """
+        GET a Polygon endpoint once the rate limiter allows it.
+
+        Args:
+            url: Endpoint URL
+            params: Per-call query parameters (apiKey comes from the session)
+
+        Returns:
+            Response from Polygon
+        """
+        _rate_limiter.acquire()
+        response = self.session.get(url, params=params, timeout=10)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "GET %s -> %s (Content-Encoding: %s, %s bytes on the wire, %d decoded)",
+                url, response.status_code, response.headers.get("Content-Encoding", "identity"),
+                response.headers.get("Content-Length", "?"), len(response.content)
+            )
+        return response
+
+    @cachedmethod(attrgetter("_financials_cache"), key=_statement_key, lock=attrgetter("_cache_lock"))
     def get_financials(
         self,
         ticker: str,
@@ -33,18 +240,23 @@ class PolygonService:
             if timeframe == "quarter":
                 timeframe = "quarterly"
 
-            url = f"{self.base_url}/vX/reference/financials"
+            symbol = ticker.upper()
+            cache_key = FileCache.make_key("financials", symbol, timeframe, limit)
+            cached = self._file_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            url = self._financials_url
             params = {
-                "ticker": ticker.upper(),
+                "ticker": symbol,
                 "timeframe": timeframe,
-                "limit": limit,
-                "apiKey": self.api_key
+                "limit": limit
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._rate_limited_get(url, params)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             results = data.get("results", [])
 
             if not results:
@@ -53,6 +265,7 @@ class PolygonService:
                     provider="polygon"
                 )
 
+            self._file_cache.set(cache_key, results, ttl=FINANCIALS_TTL)
             return results
 
         except requests.exceptions.HTTPError as e:
@@ -114,30 +327,8 @@ class PolygonService:
         Returns:
             Extracted income statement fields
         """
-        financials = financial_data.get("financials", {})
-        income_statement = financials.get("income_statement", {})
-
-        return {
-            "date": financial_data.get("end_date"),
-            "fiscal_period": financial_data.get("fiscal_period"),
-            "fiscal_year": financial_data.get("fiscal_year"),
-            # Revenue fields
-            "revenues": income_statement.get("revenues", {}).get("value"),
-            # Operating income (EBIT - Earnings Before Interest and Taxes)
-            "operating_income_loss": income_statement.get("operating_income_loss", {}).get("value"),
-            # EBITDA
-            "ebitda": income_statement.get("ebitda", {}).get("value"),
-            # Net income
-            "net_income_loss": income_statement.get("net_income_loss", {}).get("value"),
-            # Cost of revenue
-            "cost_of_revenue": income_statement.get("cost_of_revenue", {}).get("value"),
-            # Gross profit
-            "gross_profit": income_statement.get("gross_profit", {}).get("value"),
-            # Operating expenses
-            "operating_expenses": income_statement.get("operating_expenses", {}).get("value"),
-            # Interest expense (for reference)
-            "interest_expense": income_statement.get("interest_expense", {}).get("value"),
-        }
+        income_statement = (financial_data.get("financials") or {}).get("income_statement") or {}
+        return {**_period_header(financial_data), **_income_values(income_statement)}
 
     def extract_balance_sheet(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -149,43 +340,8 @@ class PolygonService:
         Returns:
             Extracted balance sheet fields
         """
-        financials = financial_data.get("financials", {})
-        balance_sheet = financials.get("balance_sheet", {})
-
-        return {
-            "date": financial_data.get("end_date"),
-            "fiscal_period": financial_data.get("fiscal_period"),
-            "fiscal_year": financial_data.get("fiscal_year"),
-            # Current assets
-            "current_assets": balance_sheet.get("current_assets", {}).get("value"),
-            # Current liabilities
-            "current_liabilities": balance_sheet.get("current_liabilities", {}).get("value"),
-            # Fixed assets (Property, Plant & Equipment)
-            "fixed_assets": balance_sheet.get("fixed_assets", {}).get("value"),
-            # Total assets
-            "assets": balance_sheet.get("assets", {}).get("value"),
-            # Total liabilities
-            "liabilities": balance_sheet.get("liabilities", {}).get("value"),
-            # Equity
-            "equity": balance_sheet.get("equity", {}).get("value"),
-            # Cash and equivalents (try multiple field names from Polygon's schema)
-            "cash_and_equivalents": (
-                balance_sheet.get("cash_and_equivalents", {}).get("value") or
-                balance_sheet.get("cash_and_short_term_investments", {}).get("value") or
-                balance_sheet.get("cash", {}).get("value")
-            ),
-            # Debt components - extract all individual fields for transparency
-            # No fallbacks - just return what Polygon provides
-            "short_long_term_debt_total": (
-                balance_sheet.get("short_long_term_debt_total", {}).get("value") or
-                balance_sheet.get("total_debt", {}).get("value")
-            ),
-            "current_debt": balance_sheet.get("debt_current", {}).get("value"),
-            "short_term_debt": balance_sheet.get("short_term_debt", {}).get("value"),
-            "current_long_term_debt": balance_sheet.get("current_long_term_debt", {}).get("value"),
-            "long_term_debt": balance_sheet.get("long_term_debt", {}).get("value"),
-            "long_term_debt_noncurrent": balance_sheet.get("long_term_debt_noncurrent", {}).get("value"),
-        }
+        balance_sheet = (financial_data.get("financials") or {}).get("balance_sheet") or {}
+        return {**_period_header(financial_data), **_balance_values(balance_sheet)}
 
     def extract_comprehensive_income(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -197,16 +353,10 @@ class PolygonService:
         Returns:
             Extracted comprehensive income fields
         """
-        financials = financial_data.get("financials", {})
-        comprehensive_income = financials.get("comprehensive_income", {})
-
-        return {
-            "date": financial_data.get("end_date"),
-            "fiscal_period": financial_data.get("fiscal_period"),
-            "fiscal_year": financial_data.get("fiscal_year"),
-            "comprehensive_income_loss": comprehensive_income.get("comprehensive_income_loss", {}).get("value"),
-        }
+        comprehensive_income = (financial_data.get("financials") or {}).get("comprehensive_income") or {}
+        return {**_period_header(financial_data), **_comprehensive_income_values(comprehensive_income)}
 
+    @cachedmethod(attrgetter("_details_cache"), key=_details_key, lock=attrgetter("_cache_lock"))
     def get_ticker_details(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
         Get ticker details including market cap and shares outstanding.
@@ -218,13 +368,18 @@ class PolygonService:
             Dictionary with ticker details or None if not found
         """
         try:
-            url = f"{self.base_url}/v3/reference/tickers/{ticker.upper()}"
-            params = {"apiKey": self.api_key}
+            symbol = ticker.upper()
+            cache_key = FileCache.make_key("ticker_details", symbol)
+            cached = self._file_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            url = self._tickers_url + symbol
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._rate_limited_get(url)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             results = data.get("results", {})
 
             if not results:
@@ -233,13 +388,16 @@ class PolygonService:
                     provider="polygon"
                 )
 
-            return {
-                "ticker": ticker.upper(),
+            details = {
+                "ticker": symbol,
                 "market_cap": results.get("market_cap"),
                 "share_class_shares_outstanding": results.get("share_class_shares_outstanding"),
                 "weighted_shares_outstanding": results.get("weighted_shares_outstanding"),
             }
 
+            self._file_cache.set(cache_key, details, ttl=DETAILS_TTL)
+            return details
+
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 401:
                 raise APIKeyError(
@@ -305,25 +463,53 @@ class PolygonService:
             List of ratio data or None if not found
         """
         try:
-            url = f"{self.base_url}/vX/reference/ratios"
-            params = {
-                "ticker": ticker.upper(),
-                "timeframe": timeframe,
-                "limit": limit,
-                "apiKey": self.api_key
-            }
+            return self._fetch_ratios(ticker, timeframe, limit)
+        except LookupError:
+            return None
+        except Exception as e:
+            print(f"Error fetching ratios for {ticker}: {e}")
+            return None
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+    @cachedmethod(attrgetter("_ratios_cache"), key=_statement_key, lock=attrgetter("_cache_lock"))
+    def _fetch_ratios(self, ticker: str, timeframe: str = "annual", limit: int = 1) -> list:
+        """
+        Fetch ratios from Polygon. Failures raise, so they are never cached.
 
-            data = response.json()
-            results = data.get("results", [])
+        Args:
+            ticker: Stock ticker symbol
+            timeframe: 'annual' or 'quarterly'
+            limit: Number of periods to retrieve
 
-            return results if results else None
+        Returns:
+            List of ratio data
 
-        except Exception as e:
-            print(f"Error fetching ratios for {ticker}: {e}")
-            return None
+        Raises:
+            LookupError: If Polygon returned no ratios
+        """
+        symbol = ticker.upper()
+        cache_key = FileCache.make_key("ratios", symbol, timeframe, limit)
+        cached = self._file_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        url = self._ratios_url
+        params = {
+            "ticker": symbol,
+            "timeframe": timeframe,
+            "limit": limit
+        }
+
+        response = self._rate_limited_get(url, params)
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        results = data.get("results", [])
+
+        if not results:
+            raise LookupError(f"No ratios for {ticker}")
+
+        self._file_cache.set(cache_key, results, ttl=RATIOS_TTL)
+        return results
 
     def extract_ratios(self, ratio_data: Dict[str, Any]) -> Dict[str, Any]:
         """
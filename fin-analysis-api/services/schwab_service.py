@@ -3,9 +3,18 @@ Schwab API Service
 Handles OAuth authentication and API interactions with Schwab
 """
 import os
+import threading
+import orjson
 import requests
+from itertools import islice
+from operator import attrgetter
 from typing import Dict, Optional
+from cachetools import TTLCache, cachedmethod
+from cachetools.keys import hashkey
 from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 from services.token_manager import TokenManager
 
 
@@ -18,6 +27,13 @@ class SchwabService:
 
     # Schwab API base URL
     API_BASE_URL = "https://api.schwabapi.com"
+    QUOTES_URL = f"{API_BASE_URL}/marketdata/v1/quotes"
+
+    # Symbols per /quotes request; longer lists are split to keep the query string bounded
+    QUOTES_CHUNK_SIZE = 100
+
+    # Quotes are real-time, so they are only reused to collapse bursts of identical requests
+    QUOTES_TTL = 2
 
     def __init__(self, app_key: str, app_secret: str, redirect_uri: str, token_manager: TokenManager):
         """
@@ -34,6 +50,37 @@ class SchwabService:
         self.redirect_uri = redirect_uri
         self.token_manager = token_manager
 
+        # Persistent session shared by token and market data calls, sized for bursts of quote requests
+        self.session = requests.Session()
+        # Transient 5xx/429 responses to market data GETs are retried with backoff, honoring Retry-After
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                allowed_methods=frozenset(["GET"]),
+                # Hand back the last response once retries run out, so the status checks below report it
+                raise_on_status=False
+            )
+        ))
+        # Token exchanges are never retried: auth codes are single-use and refresh tokens rotate,
+        # so a replayed POST would fail or burn the new token. The longer prefix takes precedence
+        self.session.mount(self.TOKEN_URL, HTTPAdapter(max_retries=0))
+
+        # Schwab requires HTTP Basic Authentication on the token endpoint only. It is passed per
+        # call rather than set as session.auth, which would replace the Bearer header on API calls
+        self._token_auth = HTTPBasicAuth(app_key, app_secret)
+
+        # Serializes token refreshes so an expiry triggers one refresh, not one per concurrent caller
+        self._refresh_lock = threading.Lock()
+
+        # Recent get_quotes results, keyed by the set of symbols requested
+        self._quotes_cache = TTLCache(maxsize=256, ttl=self.QUOTES_TTL)
+        self._quotes_lock = threading.Lock()
+
     def get_authorization_url(self) -> str:
         """
         Generate the authorization URL for OAuth flow
@@ -73,17 +120,17 @@ class SchwabService:
         }
 
         # Schwab requires HTTP Basic Authentication
-        response = requests.post(
+        response = self.session.post(
             self.TOKEN_URL,
             data=data,
             headers=headers,
-            auth=(self.app_key, self.app_secret)
+            auth=self._token_auth
         )
 
         if response.status_code != 200:
             raise Exception(f"Token exchange failed: {response.status_code} - {response.text}")
 
-        tokens = response.json()
+        tokens = orjson.loads(response.content)
 
         # Save tokens using token manager
         self.token_manager.save_tokens(tokens)
@@ -115,17 +162,17 @@ class SchwabService:
         }
 
         # Schwab requires HTTP Basic Authentication
-        response = requests.post(
+        response = self.session.post(
             self.TOKEN_URL,
             data=data,
             headers=headers,
-            auth=(self.app_key, self.app_secret)
+            auth=self._token_auth
         )
 
         if response.status_code != 200:
             raise Exception(f"Token refresh failed: {response.status_code} - {response.text}")
 
-        new_tokens = response.json()
+        new_tokens = orjson.loads(response.content)
 
         # Save new tokens
         self.token_manager.save_tokens(new_tokens)
@@ -144,12 +191,15 @@ class SchwabService:
         """
         # Check if access token is expired or will expire soon
         if self.token_manager.is_access_token_expired():
-            # If refresh token is valid, refresh
-            if self.token_manager.is_refresh_token_valid():
-                tokens = self.refresh_access_token()
-                return tokens['access_token']
-            else:
-                raise Exception("No valid tokens available. User needs to re-authenticate.")
+            # Single-flight: concurrent callers wait for one refresh, then re-check and reuse its tokens
+            with self._refresh_lock:
+                if self.token_manager.is_access_token_expired():
+                    # If refresh token is valid, refresh
+                    if self.token_manager.is_refresh_token_valid():
+                        tokens = self.refresh_access_token()
+                        return tokens['access_token']
+                    else:
+                        raise Exception("No valid tokens available. User needs to re-authenticate.")
 
         # Access token is still valid
         tokens = self.token_manager.get_tokens()
@@ -159,35 +209,38 @@ class SchwabService:
         """
         Get real-time quote for a symbol
 
+        Goes through get_quotes, so repeated single-symbol lookups share its cache.
+
         Args:
             symbol: Stock symbol (e.g., 'AAPL')
 
         Returns:
-            Quote data
+            Quote data, keyed by symbol
 
         Raises:
-            Exception: If API call fails
+            Exception: If API call fails or the symbol is not found
         """
-        access_token = self.get_valid_access_token()
-
-        # Schwab uses /marketdata/v1/{symbol}/quotes endpoint
-        url = f"{self.API_BASE_URL}/marketdata/v1/{symbol}/quotes"
+        quotes = self.get_quotes([symbol])
 
-        headers = {
-            "Authorization": f"Bearer {access_token}"
-        }
+        # The bulk endpoint answers 200 with an "errors" body for unknown symbols,
+        # where the per-symbol endpoint answered 404
+        if symbol not in quotes:
+            raise Exception(f"Failed to get quote: 404 - {orjson.dumps(quotes).decode()}")
 
-        response = requests.get(url, headers=headers)
-
-        if response.status_code != 200:
-            raise Exception(f"Failed to get quote: {response.status_code} - {response.text}")
-
-        return response.json()
+        return {symbol: quotes[symbol]}
 
+    @cachedmethod(
+        attrgetter("_quotes_cache"),
+        key=lambda self, symbols: hashkey(frozenset(symbols)),
+        lock=attrgetter("_quotes_lock")
+    )
     def get_quotes(self, symbols: list) -> Dict:
         """
         Get real-time quotes for multiple symbols
 
+        Symbols are sent in batches of QUOTES_CHUNK_SIZE per request, and results
+        are reused for QUOTES_TTL seconds for the same set of symbols.
+
         Args:
             symbols: List of stock symbols (e.g., ['AAPL', 'GOOGL'])
 
@@ -199,24 +252,26 @@ class SchwabService:
         """
         access_token = self.get_valid_access_token()
 
-        # Join symbols with commas
-        symbols_param = ",".join(symbols)
-        url = f"{self.API_BASE_URL}/marketdata/v1/quotes"
-
         headers = {
             "Authorization": f"Bearer {access_token}"
         }
 
-        params = {
-            "symbols": symbols_param
-        }
+        quotes = {}
+        symbols_iter = iter(symbols)
+        while chunk := list(islice(symbols_iter, self.QUOTES_CHUNK_SIZE)):
+            # Join symbols with commas
+            params = {
+                "symbols": ",".join(chunk)
+            }
 
-        response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(self.QUOTES_URL, headers=headers, params=params)
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to get quotes: {response.status_code} - {response.text}")
+            if response.status_code != 200:
+                raise Exception(f"Failed to get quotes: {response.status_code} - {response.text}")
+
+            quotes.update(orjson.loads(response.content))
 
-        return response.json()
+        return quotes
 
     def revoke_tokens(self) -> bool:
         """
@@ -3,13 +3,18 @@ Token Manager Service
 Handles encrypted storage and retrieval of Schwab OAuth tokens
 """
 import os
-import json
+import tempfile
+import orjson
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from cryptography.fernet import Fernet
 from pathlib import Path
 
 
+# Access tokens are treated as expired this long before they actually expire
+_BUFFER = timedelta(minutes=5)
+
+
 class TokenManager:
     """Manages encrypted storage of OAuth tokens"""
 
@@ -27,6 +32,26 @@ class TokenManager:
         # Ensure tokens directory exists
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Decrypted tokens and the file mtime they were read at; the file is only
+        # re-read and decrypted when it changes on disk
+        self._cache: Optional[Dict] = None
+        self._cache_mtime: Optional[int] = None
+        # Parsed expires_at of the cached tokens
+        self._expires_at: Optional[datetime] = None
+
+    def _remember(self, tokens: Optional[Dict], mtime: Optional[int]) -> None:
+        """
+        Cache decrypted tokens along with their file mtime and parsed expiry
+
+        Args:
+            tokens: Decrypted tokens, or None to clear the cache
+            mtime: Token file mtime (ns) the tokens correspond to
+        """
+        self._cache = tokens
+        self._cache_mtime = mtime
+        expires_at = tokens.get('expires_at') if tokens else None
+        self._expires_at = datetime.fromisoformat(expires_at) if expires_at else None
+
     def save_tokens(self, tokens: Dict) -> None:
         """
         Encrypt and save tokens to file
@@ -42,14 +67,28 @@ class TokenManager:
             expires_at = datetime.now() + timedelta(seconds=tokens['expires_in'])
             tokens['expires_at'] = expires_at.isoformat()
 
-        # Serialize to JSON
-        json_data = json.dumps(tokens, indent=2)
+        # Serialize to compact JSON (bytes; the file is encrypted, so never read by people)
+        json_data = orjson.dumps(tokens)
 
         # Encrypt
-        encrypted_data = self.cipher.encrypt(json_data.encode())
+        encrypted_data = self.cipher.encrypt(json_data)
+
+        # Write to a temp file and swap it in, so a crash mid-write never leaves a
+        # truncated token file. mkstemp gives each writer its own file, created
+        # owner-only (0o600) since it holds credentials
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.storage_path.parent, prefix=f".{self.storage_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encrypted_data)
+            os.replace(tmp_path, self.storage_path)
+        except BaseException:
+            # Don't leave encrypted credentials behind in a stray temp file
+            os.unlink(tmp_path)
+            raise
 
-        # Write to file
-        self.storage_path.write_bytes(encrypted_data)
+        self._remember(tokens, self.storage_path.stat().st_mtime_ns)
 
     def get_tokens(self) -> Optional[Dict]:
         """
@@ -58,19 +97,21 @@ class TokenManager:
         Returns:
             Dictionary containing tokens, or None if no tokens exist
         """
-        if not self.storage_path.exists():
-            return None
-
         try:
-            # Read encrypted data
-            encrypted_data = self.storage_path.read_bytes()
+            mtime = self.storage_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._remember(None, None)
+            return None
 
-            # Decrypt
-            decrypted_data = self.cipher.decrypt(encrypted_data)
+        # Unchanged since the last read: skip the decrypt
+        if self._cache is not None and mtime == self._cache_mtime:
+            return self._cache
 
-            # Parse JSON
-            tokens = json.loads(decrypted_data.decode())
+        try:
+            # Read, decrypt, and parse straight from bytes (no intermediate str)
+            tokens = orjson.loads(self.cipher.decrypt(self.storage_path.read_bytes()))
 
+            self._remember(tokens, mtime)
             return tokens
         except Exception as e:
             print(f"Error reading tokens: {e}")
@@ -83,6 +124,8 @@ class TokenManager:
         Returns:
             True if tokens were deleted, False if they didn't exist
         """
+        self._remember(None, None)
+
         if self.storage_path.exists():
             self.storage_path.unlink()
             return True
@@ -95,14 +138,11 @@ class TokenManager:
         Returns:
             True if token is expired or will expire in < 5 minutes
         """
-        tokens = self.get_tokens()
-        if not tokens or 'expires_at' not in tokens:
+        # Picks up (and re-parses) tokens changed on disk; otherwise just a stat
+        if not self.get_tokens():
             return True
 
-        expires_at = datetime.fromisoformat(tokens['expires_at'])
-        buffer_time = timedelta(minutes=5)
-
-        return datetime.now() >= (expires_at - buffer_time)
+        return self._expires_at is None or datetime.now() >= self._expires_at - _BUFFER
 
     def is_refresh_token_valid(self) -> bool:
         """
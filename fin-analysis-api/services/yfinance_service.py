@@ -1,27 +1,291 @@
+import hashlib
+import logging
+import math
+import os
+import threading
 import yfinance as yf
+import numpy as np
 import pandas as pd
+import requests
 import time
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import Future, ThreadPoolExecutor
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any
+from config import settings
+from services.cache import FileCache
 from services.exceptions import RateLimitError, DataNotFoundError, FinancialDataError
 
+logger = logging.getLogger(__name__)
+
+# Cache TTLs: statements only change when a new period is reported, so they persist on
+# disk for long but stay in memory briefly (bounding it); market cap moves with the price
+FINANCIALS_TTL = 90 * 24 * 60 * 60
+FINANCIALS_MEMORY_TTL = 15 * 60
+DETAILS_TTL = 60
+
+# Part of every on-disk cache key; bump it when the cached period layout changes
+_CACHE_SCHEMA = 2
+
+# Earliest time (epoch seconds) the next Yahoo request may start, shared by all workers
+_NEXT_REQUEST_KEY = "next_request_at"
+
+# Output field -> yfinance row label, or labels tried in order (first non-zero wins).
+# These are Yahoo's raw (pretty=False) labels, e.g. 'TotalRevenue' for 'Total Revenue'
+_INCOME_FIELDS = {
+    "revenues": 'TotalRevenue',
+    "operating_income_loss": 'OperatingIncome',  # Operating income (EBIT)
+    "ebitda": 'EBITDA',
+    "net_income_loss": 'NetIncome',
+    "cost_of_revenue": 'CostOfRevenue',
+    "gross_profit": 'GrossProfit',
+    "operating_expenses": 'OperatingExpense',
+    "interest_expense": 'InterestExpense',  # For reference
+}
+_BALANCE_FIELDS = {
+    "current_assets": 'CurrentAssets',
+    "current_liabilities": 'CurrentLiabilities',
+    "fixed_assets": 'NetPPE',  # Property, Plant & Equipment
+    "assets": 'TotalAssets',
+    "liabilities": 'TotalLiabilitiesNetMinorityInterest',
+    "equity": 'StockholdersEquity',
+    "cash_and_equivalents": ('CashAndCashEquivalents', 'CashCashEquivalentsAndShortTermInvestments'),
+    # Debt components for Enterprise Value calculation; not all companies report these separately
+    "current_debt": ('CurrentDebt', 'CurrentDebtAndCapitalLeaseObligation'),
+    "long_term_debt": ('LongTermDebt', 'LongTermDebtAndCapitalLeaseObligation'),
+    "short_long_term_debt_total": 'TotalDebt',
+    # Individual debt fields for transparency
+    "short_term_debt": 'ShortTermDebt',
+    "current_long_term_debt": 'CurrentLongTermDebt',
+    "long_term_debt_noncurrent": 'LongTermDebtNoncurrent',
+}
+
+
+def _row_labels(fields: Dict[str, Any]) -> pd.Index:
+    """
+    Flatten a field map into the row labels it reads, aliases included.
+
+    Args:
+        fields: Output field -> row label(s) mapping
+
+    Returns:
+        Row labels in field order
+    """
+    return pd.Index([label for spec in fields.values() for label in ((spec,) if isinstance(spec, str) else spec)])
+
+
+# Built once so each extraction reindexes against a ready-made Index
+_INCOME_LABELS = _row_labels(_INCOME_FIELDS)
+_BALANCE_LABELS = _row_labels(_BALANCE_FIELDS)
+
+
+def _content_hash(statement: pd.Series) -> str:
+    """
+    Hash a statement column's labels and values.
+
+    Args:
+        statement: Statement column
+
+    Returns:
+        SHA1 hex digest of the column's contents
+    """
+    return hashlib.sha1(pd.util.hash_pandas_object(statement, index=True).values.tobytes()).hexdigest()
+
+
+def _statement_values(statement: Any, fields: Dict[str, Any], labels: pd.Index) -> Dict[str, Optional[float]]:
+    """
+    Pull the mapped fields out of one period's statement in a single reindex.
+
+    Args:
+        statement: Statement column (pd.Series indexed by yfinance row label)
+        fields: Output field -> row label(s) mapping
+        labels: The mapping's row labels, from _row_labels
+
+    Returns:
+        Output field -> float value, or None where missing/NaN
+    """
+    if not isinstance(statement, pd.Series):
+        statement = pd.Series(statement, dtype=object)
+
+    raw = pd.to_numeric(statement.reindex(labels), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    by_label = {label: None if math.isnan(v) else v for label, v in zip(labels, raw.tolist())}
+
+    values = {}
+    for out, spec in fields.items():
+        if isinstance(spec, str):
+            values[out] = by_label[spec]
+        else:
+            # Same semantics as chaining the lookups with `or`
+            value = None
+            for label in spec:
+                value = by_label[label]
+                if value:
+                    break
+            values[out] = value
+    return values
+
 
 class YFinanceService:
     """Service class to interact with Yahoo Finance via yfinance library."""
 
     def __init__(self):
-        self._cache = {}  # Simple cache to avoid repeated requests
-        self._last_request_time = 0
+        # Bounded in-memory caches; entries expire so memory stays flat in long-running workers
+        self._financials_cache = TTLCache(maxsize=2048, ttl=FINANCIALS_MEMORY_TTL)
+        self._details_cache = TTLCache(maxsize=2048, ttl=DETAILS_TTL)
+        # yf.Ticker objects by symbol. yfinance memoizes fetched data on the object itself,
+        # so they are only reused briefly, keeping that data no staler than the details cache
+        self._ticker_cache = TTLCache(maxsize=512, ttl=DETAILS_TTL)
+        self._cache_lock = threading.Lock()
+        # Persistent cache under the in-memory ones, so restarts don't re-fetch from Yahoo
+        self._file_cache = FileCache("yfinance")
+        # Rate limiter state lives on disk so the spacing holds across worker processes; it has
+        # its own directory so it is never culled along with (or disabled like) cached results
+        self._limits = Cache(os.path.join(settings.cache_dir, "yfinance-limits"))
         self._min_request_interval = 0.5  # Minimum 0.5 seconds between requests
+        self._session = None  # Shared keep-alive session, created by warmup() or on first use
+        # Extracted field values keyed by (statement content hash, statement name)
+        self._extract_cache = LRUCache(maxsize=1024)
+        self._extract_lock = threading.Lock()
+        # Fetches in progress by cache key, shared with identical requests arriving meanwhile
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Runs the income statement fetch alongside the balance sheet fetch
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="yfinance")
+
+    def warmup(self):
+        """Create the shared HTTP session ahead of the first request."""
+        self._get_session()
+
+    def _get_session(self) -> requests.Session:
+        """Return the shared keep-alive session used for all Yahoo Finance requests."""
+        if self._session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+            self._session = session
+        return self._session
+
+    def _reserve_slot(self) -> float:
+        """
+        Reserve the next free request slot, _min_request_interval after the previous one.
+
+        Slots are handed out through the disk cache, so the spacing holds across
+        threads and worker processes.
+
+        Returns:
+            Seconds to wait before the reserved slot starts
+        """
+        with self._limits.transact():
+            now = time.time()
+            start = max(now, self._limits.get(_NEXT_REQUEST_KEY, 0))
+            self._limits.set(_NEXT_REQUEST_KEY, start + self._min_request_interval)
+        return start - now
 
     def _rate_limit(self):
         """Implement simple rate limiting to avoid Yahoo Finance blocking."""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
+        wait = self._reserve_slot()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _cached(self, cache: TTLCache, cache_key: str) -> Optional[Any]:
+        """
+        Look up a result in memory, then on disk (promoting disk hits to memory).
+
+        Args:
+            cache: In-memory cache for this kind of result
+            cache_key: Cache key of the result
+
+        Returns:
+            Cached result, or None if not cached
+        """
+        with self._cache_lock:
+            result = cache.get(cache_key)
+        if result is None:
+            result = self._file_cache.get(FileCache.make_key(_CACHE_SCHEMA, cache_key))
+            if result is not None:
+                with self._cache_lock:
+                    cache[cache_key] = result
+        return result
+
+    def _store(self, cache: TTLCache, cache_key: str, result: Any, ttl: float) -> None:
+        """
+        Cache a result in memory and on disk.
+
+        Args:
+            cache: In-memory cache for this kind of result
+            cache_key: Cache key of the result
+            result: Result to cache
+            ttl: Seconds the on-disk entry stays valid
+        """
+        with self._cache_lock:
+            cache[cache_key] = result
+        self._file_cache.set(FileCache.make_key(_CACHE_SCHEMA, cache_key), result, ttl=ttl)
+
+    def _tickers(self, symbols: list[str]) -> Dict[str, yf.Ticker]:
+        """
+        Get yf.Ticker objects for upper-cased symbols, building any that aren't cached.
+
+        Each symbol gets its own yf.Ticker rather than going through yf.Tickers, which
+        splits its input on spaces and commas (so e.g. "BRK B" would have no entry).
+
+        Args:
+            symbols: Upper-cased ticker symbols
+
+        Returns:
+            Dictionary mapping each symbol to its yf.Ticker
+        """
+        found = {}
+        with self._cache_lock:
+            for symbol in symbols:
+                stock = self._ticker_cache.get(symbol)
+                if stock is not None:
+                    found[symbol] = stock
+
+        missing = [symbol for symbol in symbols if symbol not in found]
+        if missing:
+            session = self._get_session()
+            built = {symbol: yf.Ticker(symbol, session=session) for symbol in missing}
+            with self._cache_lock:
+                self._ticker_cache.update(built)
+            found.update(built)
+        return found
+
+    def _coalesced(self, cache: TTLCache, cache_key: str, fetch, *args):
+        """
+        Run fetch(*args), or wait for an identical fetch already in flight and share its outcome.
+
+        Concurrent cache misses for the same key would otherwise each make the same
+        Yahoo requests and compete for the rate limit.
+
+        Args:
+            cache: In-memory cache the result lands in
+            cache_key: Cache key of the data being fetched
+            fetch: Function that fetches (and caches) the data
+            *args: Arguments for fetch
+
+        Returns:
+            The result of fetch; its exception is raised to every waiting caller
+        """
+        future = Future()
+        with self._inflight_lock:
+            inflight = self._inflight.setdefault(cache_key, future)
 
-        if time_since_last_request < self._min_request_interval:
-            time.sleep(self._min_request_interval - time_since_last_request)
+        if inflight is not future:
+            return inflight.result()
 
-        self._last_request_time = time.time()
+        try:
+            # An identical fetch may have finished between the caller's cache miss and now
+            result = self._cached(cache, cache_key)
+            if result is None:
+                result = fetch(*args)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
 
     def get_financials(
         self,
@@ -40,58 +304,143 @@ class YFinanceService:
         Returns:
             List of financial data or None if not found
         """
-        print(f"Fetching financials for {ticker} from yfinance.")
-        try:
-            # Check cache first
-            cache_key = f"{ticker}_{timeframe}_{limit}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
+        logger.debug("Fetching financials for %s from yfinance", ticker)
+        # Check cache first
+        cache_key = f"{ticker}_{timeframe}_{limit}"
+        cached = self._cached(self._financials_cache, cache_key)
+        if cached is not None:
+            return cached
+
+        # self._rate_limit()
+        stock = self._tickers([ticker.upper()])[ticker.upper()]
+        return self._coalesced(
+            self._financials_cache, cache_key, self._financials_from, stock, ticker, timeframe, limit
+        )
+
+    def get_financials_batch(
+        self,
+        tickers: list[str],
+        timeframe: str = "annual",
+        limit: int = 1
+    ) -> Dict[str, Optional[list]]:
+        """
+        Get financial statements for several tickers concurrently.
+
+        All symbols share the keep-alive session and are fetched in parallel so latency tracks the slowest symbol rather than the
+        sum; results land in the same per-ticker cache entries get_financials uses.
 
-            # self._rate_limit()
-            print(f"GOT HERE 1 {ticker} {timeframe} {limit}")
-            stock = yf.Ticker(ticker.upper())
-            print(f"GOT HERE 2 {ticker} {stock.info}")
+        Args:
+            tickers: Stock ticker symbols
+            timeframe: 'annual' or 'quarterly'
+            limit: Number of periods to retrieve per ticker (max 4 for yfinance)
+
+        Returns:
+            Dictionary mapping each ticker to its financial data list, or None if no data was found
 
+        Raises:
+            RateLimitError, FinancialDataError: These affect every symbol, so they abort the batch
+        """
+        results = {}
+        missing = []
+        for ticker in tickers:
+            cached = self._cached(self._financials_cache, f"{ticker}_{timeframe}_{limit}")
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                missing.append(ticker)
+
+        if missing:
+            batch = self._tickers([t.upper() for t in missing])
+
+            def fetch(ticker: str) -> Optional[list]:
+                try:
+                    return self._coalesced(
+                        self._financials_cache, f"{ticker}_{timeframe}_{limit}",
+                        self._financials_from, batch[ticker.upper()], ticker, timeframe, limit
+                    )
+                except DataNotFoundError as e:
+                    logger.warning("No yfinance financials for %s in batch: %s", ticker, e.message)
+                    return None
+
+            # A pool of its own: _financials_from also submits to self._executor,
+            # and sharing it with the outer tasks could exhaust its workers
+            with ThreadPoolExecutor(max_workers=8, thread_name_prefix="yfinance-batch") as pool:
+                results.update(zip(missing, pool.map(fetch, missing)))
+
+        return {ticker: results[ticker] for ticker in tickers}
+
+    def _financials_from(
+        self,
+        stock: yf.Ticker,
+        ticker: str,
+        timeframe: str,
+        limit: int
+    ) -> Optional[list]:
+        """
+        Build (and cache) the financial data list for one yfinance Ticker.
 
-            # Get financial statements based on timeframe
-            if timeframe == "annual":
-                income_stmt = stock.financials
-                balance_sheet = stock.balance_sheet
-            else:  # quarterly
-                income_stmt = stock.quarterly_financials
-                balance_sheet = stock.quarterly_balance_sheet
+        Args:
+            stock: yfinance Ticker to read statements from
+            ticker: Stock ticker symbol as requested
+            timeframe: 'annual' or 'quarterly'
+            limit: Number of periods to retrieve
+
+        Returns:
+            List of financial data or None if not found
+        """
+        try:
+            cache_key = f"{ticker}_{timeframe}_{limit}"
+
+            # Get financial statements based on timeframe; they are separate Yahoo
+            # requests, so fetch the balance sheet in the pool meanwhile. pretty=False
+            # keeps Yahoo's raw row labels, skipping yfinance's frame copy and relabeling
+            freq = "yearly" if timeframe == "annual" else "quarterly"
+            balance_future = self._executor.submit(stock.get_balance_sheet, pretty=False, freq=freq)
+            income_stmt = stock.get_income_stmt(pretty=False, freq=freq)
+            # Fail fast: without an income statement there is nothing to return,
+            # so don't wait on the balance sheet
+            balance_sheet = None if income_stmt.empty else balance_future.result()
 
             # Check if data is available
-            if income_stmt.empty or balance_sheet.empty:
+            if balance_sheet is None or balance_sheet.empty:
+                balance_future.cancel()
                 raise DataNotFoundError(
                     f"No financial data available for ticker {ticker}. The ticker may be invalid or data is not available from Yahoo Finance.",
                     provider="yfinance"
                 )
-            print(f"GOT HERE 3 {ticker} {timeframe} {limit}")
+
             # yfinance returns DataFrames with columns as dates
             # We need to convert to list format similar to Polygon
             results = []
 
-            # Get up to 'limit' periods
+            # Get up to 'limit' periods; dates and years are formatted in one pass over the index
             num_periods = min(limit, len(income_stmt.columns))
+            period_ends = pd.DatetimeIndex(income_stmt.columns[:num_periods])
+            end_dates = period_ends.strftime('%Y-%m-%d').tolist()
+            fiscal_years = period_ends.year.astype(str).tolist()
 
-            for i in range(num_periods):
+            for i, (end_date, fiscal_year, (_, income), (_, balance)) in enumerate(
+                zip(end_dates, fiscal_years, income_stmt.items(), balance_sheet.items())
+            ):
                 period_data = {
-                    "end_date": income_stmt.columns[i].strftime('%Y-%m-%d'),
+                    "end_date": end_date,
                     "fiscal_period": "FY" if timeframe == "annual" else f"Q{((i % 4) + 1)}",
-                    "fiscal_year": str(income_stmt.columns[i].year),
+                    "fiscal_year": fiscal_year,
                     "financials": {
-                        "income_statement": income_stmt.iloc[:, i].to_dict(),
-                        "balance_sheet": balance_sheet.iloc[:, i].to_dict()
+                        # Column views; the extractors reindex them directly
+                        "income_statement": income,
+                        "balance_sheet": balance
                     }
                 }
+                # Content hashes, so repeat extractions of the same numbers are memoized
+                period_data["statement_hashes"] = {
+                    name: _content_hash(series) for name, series in period_data["financials"].items()
+                }
                 results.append(period_data)
 
             # Cache the results
             if results:
-                self._cache[cache_key] = results
-
-            print(f"RESULTS HERE {results}")
+                self._store(self._financials_cache, cache_key, results, FINANCIALS_TTL)
 
             return results if results else None
 
@@ -101,10 +450,6 @@ class YFinanceService:
         except Exception as e:
             error_msg = str(e).lower()
 
-            # Capture any printed output that might contain rate limit info
-            import sys
-            import io
-
             # Check for rate limit errors from Yahoo Finance
             # Note: yfinance sometimes prints "429" errors but raises JSONDecodeError
             if ("rate limit" in error_msg or "too many requests" in error_msg or "429" in error_msg or
@@ -124,47 +469,66 @@ class YFinanceService:
                 )
 
             # Generic error
-            print(f"Error fetching financials for {ticker}: {e}")
+            logger.warning("Error fetching financials for %s: %s", ticker, e)
             raise DataNotFoundError(
                 f"Yahoo Finance error for {ticker}: {str(e)}",
                 provider="yfinance",
                 original_error=e
             )
 
-    def extract_income_statement(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract(
+        self,
+        financial_data: Dict[str, Any],
+        statement: str,
+        fields: Dict[str, Any],
+        labels: pd.Index
+    ) -> Dict[str, Any]:
         """
-        Extract income statement fields from yfinance financial data.
+        Map one statement of a period onto our field names.
+
+        Values are memoized by the statement's content hash; the period header is
+        always taken from financial_data, since identical numbers can recur across periods.
 
         Args:
             financial_data: Raw financial data from yfinance
+            statement: Statement key under "financials"
+            fields: Output field -> row label(s) mapping
+            labels: The mapping's row labels, from _row_labels
 
         Returns:
-            Extracted income statement fields
+            Period header fields plus the mapped statement fields
         """
-        income_statement = financial_data.get("financials", {}).get("income_statement", {})
+        digest = financial_data.get("statement_hashes", {}).get(statement)
+        values = None
+        if digest is not None:
+            with self._extract_lock:
+                values = self._extract_cache.get((digest, statement))
+
+        if values is None:
+            values = _statement_values(financial_data.get("financials", {}).get(statement, {}), fields, labels)
+            if digest is not None:
+                with self._extract_lock:
+                    self._extract_cache[(digest, statement)] = values
 
         return {
             "date": financial_data.get("end_date"),
             "fiscal_period": financial_data.get("fiscal_period"),
             "fiscal_year": financial_data.get("fiscal_year"),
-            # Revenue fields
-            "revenues": self._safe_get(income_statement, 'Total Revenue'),
-            # Operating income (EBIT - Earnings Before Interest and Taxes)
-            "operating_income_loss": self._safe_get(income_statement, 'Operating Income'),
-            # EBITDA
-            "ebitda": self._safe_get(income_statement, 'EBITDA'),
-            # Net income
-            "net_income_loss": self._safe_get(income_statement, 'Net Income'),
-            # Cost of revenue
-            "cost_of_revenue": self._safe_get(income_statement, 'Cost Of Revenue'),
-            # Gross profit
-            "gross_profit": self._safe_get(income_statement, 'Gross Profit'),
-            # Operating expenses
-            "operating_expenses": self._safe_get(income_statement, 'Operating Expense'),
-            # Interest expense (for reference)
-            "interest_expense": self._safe_get(income_statement, 'Interest Expense'),
+            **values,
         }
 
+    def extract_income_statement(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract income statement fields from yfinance financial data.
+
+        Args:
+            financial_data: Raw financial data from yfinance
+
+        Returns:
+            Extracted income statement fields
+        """
+        return self._extract(financial_data, "income_statement", _INCOME_FIELDS, _INCOME_LABELS)
+
     def extract_balance_sheet(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract balance sheet fields from yfinance financial data.
@@ -175,47 +539,7 @@ class YFinanceService:
         Returns:
             Extracted balance sheet fields
         """
-        balance_sheet = financial_data.get("financials", {}).get("balance_sheet", {})
-
-        return {
-            "date": financial_data.get("end_date"),
-            "fiscal_period": financial_data.get("fiscal_period"),
-            "fiscal_year": financial_data.get("fiscal_year"),
-            # Current assets
-            "current_assets": self._safe_get(balance_sheet, 'Current Assets'),
-            # Current liabilities
-            "current_liabilities": self._safe_get(balance_sheet, 'Current Liabilities'),
-            # Fixed assets (Property, Plant & Equipment)
-            "fixed_assets": self._safe_get(balance_sheet, 'Net PPE'),
-            # Total assets
-            "assets": self._safe_get(balance_sheet, 'Total Assets'),
-            # Total liabilities
-            "liabilities": self._safe_get(balance_sheet, 'Total Liabilities Net Minority Interest'),
-            # Equity
-            "equity": self._safe_get(balance_sheet, 'Stockholders Equity'),
-            # Cash and equivalents (try multiple field names)
-            "cash_and_equivalents": (
-                self._safe_get(balance_sheet, 'Cash And Cash Equivalents') or
-                self._safe_get(balance_sheet, 'Cash Cash Equivalents And Short Term Investments')
-            ),
-            # Debt components for Enterprise Value calculation
-            # Note: Not all companies report these separately
-            # Keep existing fallbacks (they make sense for yfinance field naming)
-            "current_debt": (
-                self._safe_get(balance_sheet, 'Current Debt') or
-                self._safe_get(balance_sheet, 'Current Debt And Capital Lease Obligation')
-            ),
-            "long_term_debt": (
-                self._safe_get(balance_sheet, 'Long Term Debt') or
-                self._safe_get(balance_sheet, 'Long Term Debt And Capital Lease Obligation')
-            ),
-            # Total debt (if available)
-            "short_long_term_debt_total": self._safe_get(balance_sheet, 'Total Debt'),
-            # Individual debt fields for transparency
-            "short_term_debt": self._safe_get(balance_sheet, 'Short Term Debt'),
-            "current_long_term_debt": self._safe_get(balance_sheet, 'Current Long Term Debt'),
-            "long_term_debt_noncurrent": self._safe_get(balance_sheet, 'Long Term Debt Noncurrent'),
-        }
+        return self._extract(financial_data, "balance_sheet", _BALANCE_FIELDS, _BALANCE_LABELS)
 
     def get_ticker_details(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -224,17 +548,68 @@ class YFinanceService:
         Args:
             ticker: Stock ticker symbol
 
+        Returns:
+            Dictionary with ticker details or None if not found
+        """
+        # Check cache first
+        cache_key = f"details_{ticker}"
+        cached = self._cached(self._details_cache, cache_key)
+        if cached is not None:
+            return cached
+
+        stock = self._tickers([ticker.upper()])[ticker.upper()]
+        return self._coalesced(self._details_cache, cache_key, self._details_from, stock, ticker)
+
+    def get_ticker_details_batch(self, tickers: list[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get ticker details for several tickers.
+
+        Args:
+            tickers: Stock ticker symbols
+
+        Returns:
+            Dictionary mapping each ticker to its details, or None if none were found
+
+        Raises:
+            RateLimitError, FinancialDataError: These affect every symbol, so they abort the batch
+        """
+        results = {}
+        missing = []
+        for ticker in tickers:
+            cached = self._cached(self._details_cache, f"details_{ticker}")
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                missing.append(ticker)
+
+        if missing:
+            batch = self._tickers([t.upper() for t in missing])
+            for ticker in missing:
+                try:
+                    results[ticker] = self._coalesced(
+                        self._details_cache, f"details_{ticker}", self._details_from, batch[ticker.upper()], ticker
+                    )
+                except DataNotFoundError as e:
+                    logger.warning("No yfinance ticker details for %s in batch: %s", ticker, e.message)
+                    results[ticker] = None
+
+        return {ticker: results[ticker] for ticker in tickers}
+
+    def _details_from(self, stock: yf.Ticker, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Build (and cache) ticker details for one yfinance Ticker.
+
+        Args:
+            stock: yfinance Ticker to read from
+            ticker: Stock ticker symbol as requested
+
         Returns:
             Dictionary with ticker details or None if not found
         """
         try:
-            # Check cache first
             cache_key = f"details_{ticker}"
-            if cache_key in self._cache:
-                return self._cache[cache_key]
-
+            # Here rather than in the callers, so requests coalesced onto this fetch don't take slots
             self._rate_limit()
-            stock = yf.Ticker(ticker.upper())
 
             # Use fast_info if available (less data, faster, fewer rate limit issues)
             try:
@@ -250,7 +625,7 @@ class YFinanceService:
                 }
 
                 # Cache the result
-                self._cache[cache_key] = result
+                self._store(self._details_cache, cache_key, result, DETAILS_TTL)
                 return result
             except:
                 # Fallback to regular info (slower, more prone to rate limits)
@@ -273,7 +648,7 @@ class YFinanceService:
                 }
 
                 # Cache the result
-                self._cache[cache_key] = result
+                self._store(self._details_cache, cache_key, result, DETAILS_TTL)
                 return result
 
         except Exception as e:
@@ -297,33 +672,13 @@ class YFinanceService:
                     original_error=e
                 )
 
-            print(f"Error fetching ticker details for {ticker}: {e}")
+            logger.warning("Error fetching ticker details for %s: %s", ticker, e)
             raise DataNotFoundError(
                 f"Unable to get ticker details for {ticker} from Yahoo Finance: {str(e)}",
                 provider="yfinance",
                 original_error=e
             )
 
-    @staticmethod
-    def _safe_get(data_dict: Dict, key: str) -> Optional[float]:
-        """
-        Safely get value from dictionary, handling NaN and missing values.
-
-        Args:
-            data_dict: Dictionary to extract from
-            key: Key to look for
-
-        Returns:
-            Float value or None if not available
-        """
-        try:
-            value = data_dict.get(key)
-            if value is None or (isinstance(value, float) and pd.isna(value)):
-                return None
-            return float(value)
-        except (TypeError, ValueError, KeyError):
-            return None
-
 
 # Create a single instance to be used throughout the app
 yfinance_service = YFinanceService()